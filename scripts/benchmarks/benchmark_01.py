@@ -0,0 +1,75 @@
+"""
+
+Storage backends:
+
+    csv:      pandas csv parsing + pd.to_datetime on every read
+    columnar: one raw binary file per column + a native datetime64 index
+
+Each load is run in a fresh process so that the peak RSS reported is the
+cost of the load itself rather than of whatever ran before it.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import resource
+import time
+
+from multiprocessing import get_context
+
+from cowboysmall.data.file import build_index_file, build_master_file, read_index_file, read_master_file
+from cowboysmall.feature import INDICES, COLUMNS
+
+
+
+# %% 2 -
+BACKENDS = ['csv', 'columnar']
+REPEATS  = 20
+
+SELECTIONS = {
+    'full':      {},
+    'selection': {'columns': COLUMNS[:-1], 'start': '2023-01-02', 'end': '2023-12-29'}
+}
+
+
+
+# %% 3 -
+def load_all(backend, selection):
+    read_master_file(backend = backend, **selection)
+
+    for index, column in zip(INDICES, COLUMNS):
+        read_index_file(index, backend = backend, **{**selection, 'columns': [column] if selection else None})
+
+
+def measure(backend, selection):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        load_all(backend, selection)
+    elapsed = (time.perf_counter() - start) / REPEATS
+
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+
+# %% 4 - build the columnar copies before timing anything - reads never write them
+built = [build_master_file(), *(build_index_file(index) for index in INDICES)]
+
+if not all(built):
+    raise AssertionError("columnar copies are not fresh, so the columnar rows would time the csv fallback")
+
+
+
+# %% 5 -
+with get_context('fork').Pool(1, maxtasksperchild = 1) as pool:
+    results = {
+        (backend, name): pool.apply(measure, (backend, selection))
+        for name, selection in SELECTIONS.items() for backend in BACKENDS
+    }
+
+print()
+for (backend, name), (elapsed, rss) in results.items():
+    print(f"{backend.rjust(8)} - {name.ljust(9)}: {elapsed * 1000:8.2f} ms per load - peak RSS +{rss / 1024:6.1f} MB")
+print()
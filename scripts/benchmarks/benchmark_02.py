@@ -0,0 +1,44 @@
+"""
+
+Serial retrieve_data vs concurrent retrieve_many, against a local stand-in
+for yfinance.download that injects latency and transient failures - so the
+numbers reflect the retrieval strategy rather than the network.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import time
+
+from cowboysmall.data.index import RATE_LIMITS, retrieve_data, retrieve_many
+
+from scripts.benchmarks.common import stand_in
+
+
+
+# %% 2 -
+LATENCY  = 0.25
+FAILURES = 0.1
+TICKERS  = [f"T{i:03d}" for i in range(100)]
+
+RATE_LIMITS['stand-in'] = 40.0
+
+
+
+# %% 3 -
+for count in [7, 100]:
+    download = stand_in(LATENCY, 0.0)
+
+    start = time.perf_counter()
+    for ticker in TICKERS[:count]:
+        retrieve_data(ticker, download = download)
+    serial = time.perf_counter() - start
+
+    download = stand_in(LATENCY, FAILURES)
+
+    start = time.perf_counter()
+    retrieved, failed = retrieve_many(TICKERS[:count], workers = 16, source = 'stand-in', backoff = 0.1, download = download)
+    concurrent = time.perf_counter() - start
+
+    print(f"{count:>4} tickers - serial: {serial:6.2f}s - concurrent: {concurrent:6.2f}s - retrieved: {len(retrieved)} - failed: {len(failed)}")
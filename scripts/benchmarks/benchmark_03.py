@@ -0,0 +1,79 @@
+"""
+
+merge_data - pd.concat + ffill over the full union of dates, then slice,
+against the windowed merge into a preallocated array - on synthetic
+universes of indices with staggered trading calendars and long histories
+that mostly fall outside the requested window.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from cowboysmall.data.master import merge_data
+
+
+
+# %% 2 -
+COLUMNS = ['OPEN', 'HIGH', 'LOW', 'CLOSE', 'ADJ_CLOSE', 'VOLUME', 'DAILY_RETURNS']
+
+
+
+# %% 3 -
+def synthetic(count, seed = 1337):
+    rng  = np.random.default_rng(seed)
+    days = pd.bdate_range('1990-01-01', '2023-12-29', name = 'Date')
+
+    data = []
+    for i in range(count):
+        index = days[rng.random(len(days)) > 0.05]
+        data.append(pd.DataFrame(
+            rng.normal(size = (len(index), len(COLUMNS))),
+            index   = index,
+            columns = [f"I{i:04d}_{column}" for column in COLUMNS]
+        ))
+
+    return data
+
+
+def concat_merge(data, start_date = '2018-01-02', end_date = '2023-12-29'):
+    merged = pd.concat(data, axis = 1, sort = True)
+
+    merged.ffill(inplace = True)
+
+    merged['MONTH']   = merged.index.month
+    merged['QUARTER'] = merged.index.quarter
+    merged['YEAR']    = merged.index.year
+
+    return merged[start_date:end_date]
+
+
+def measure(merge, data):
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    merge(data)
+    elapsed = time.perf_counter() - start
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+
+# %% 4 -
+print()
+for count in [7, 100, 500]:
+    data = synthetic(count)
+
+    for name, merge in [('concat', concat_merge), ('windowed', merge_data)]:
+        elapsed, peak = measure(merge, data)
+        print(f"{count:>4} indices - {name.rjust(8)}: {elapsed:7.3f}s - peak {peak / 1024 ** 2:8.1f} MB")
+print()
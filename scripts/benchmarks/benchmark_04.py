@@ -0,0 +1,33 @@
+"""
+
+Compact dtypes for the master data - memory saved per column, and an audit
+of how far the indicators computed from the compact columns drift from
+those computed at full precision.
+
+"""
+
+
+
+# %% 1 - import required libraries
+from cowboysmall.data.compact import audit_precision, memory_savings
+from cowboysmall.data.file import read_master_file
+from cowboysmall.feature.indicators import get_all_indicators
+
+
+
+# %% 2 -
+master  = read_master_file()
+compact = read_master_file(compact = True)
+
+
+
+# %% 3 - memory savings per column
+table = memory_savings(master, compact)
+
+print(f"\n{table}\n")
+print(f"total: {table['BEFORE'].sum() / 1024:.1f} KB -> {table['AFTER'].sum() / 1024:.1f} KB\n")
+
+
+
+# %% 4 - indicator precision audit
+print(f"\n{audit_precision(master, compact, get_all_indicators)}\n")
@@ -0,0 +1,51 @@
+"""
+
+Phase 2 summary tables - reading the master data and aggregating in pandas,
+against pushing the same aggregations into the embedded SQLite store.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import time
+
+import pandas as pd
+
+from cowboysmall.data.file import read_master_file
+from cowboysmall.data.sql import ingest, pivot, summary
+from cowboysmall.feature import COLUMNS
+
+
+
+# %% 2 -
+REPEATS = 20
+
+ingest(read_master_file())
+
+
+
+# %% 3 -
+def pandas_tables():
+    master = read_master_file()
+
+    for column in COLUMNS:
+        master.groupby("YEAR")[column].agg(['count', 'mean', 'std', 'var'])
+        pd.pivot_table(master, values = column, index = ["YEAR"], columns = ["QUARTER"], aggfunc = "mean")
+
+
+def sql_tables():
+    for column in COLUMNS:
+        summary(column, "YEAR")
+        pivot(column, "YEAR")
+
+
+
+# %% 4 -
+print()
+for name, tables in [('pandas', pandas_tables), ('sqlite', sql_tables)]:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        tables()
+    print(f"{name.rjust(6)}: {(time.perf_counter() - start) / REPEATS * 1000:8.2f} ms for {len(COLUMNS)} summaries + pivots")
+print()
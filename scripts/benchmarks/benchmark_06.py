@@ -0,0 +1,64 @@
+"""
+
+indicators - one ta call per indicator per instrument against one engine
+call per indicator over the whole (time x instrument) array - times both on
+synthetic universes of 7, 100 and 1000 instruments - the parity of the two
+is checked by tests/test_engine.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import numpy as np
+import pandas as pd
+
+import ta
+
+from cowboysmall.feature import engine
+
+from scripts.benchmarks.common import bars, timed
+
+
+
+# %% 2 -
+INDICATORS = {
+    'RSI': (lambda c, h, l, v: ta.momentum.rsi(c),                    lambda c, h, l, v: engine.rsi(c)),
+    'ROC': (lambda c, h, l, v: ta.momentum.roc(c),                    lambda c, h, l, v: engine.roc(c)),
+    'AWE': (lambda c, h, l, v: ta.momentum.awesome_oscillator(h, l),  lambda c, h, l, v: engine.awesome_oscillator(h, l)),
+    'KAM': (lambda c, h, l, v: ta.momentum.kama(c),                   lambda c, h, l, v: engine.kama(c)),
+    'TSI': (lambda c, h, l, v: ta.momentum.tsi(c),                    lambda c, h, l, v: engine.tsi(c)),
+    'VPT': (lambda c, h, l, v: ta.volume.volume_price_trend(c, v),    lambda c, h, l, v: engine.volume_price_trend(c, v)),
+    'ULC': (lambda c, h, l, v: ta.volatility.ulcer_index(c),          lambda c, h, l, v: engine.ulcer_index(c)),
+    'SMA': (lambda c, h, l, v: ta.trend.sma_indicator(c),             lambda c, h, l, v: engine.sma_indicator(c)),
+    'EMA': (lambda c, h, l, v: ta.trend.ema_indicator(c),             lambda c, h, l, v: engine.ema_indicator(c))
+}
+
+
+
+# %% 3 -
+def per_column(indicator, arrays):
+    return np.column_stack([
+        indicator(*[pd.Series(array[:, i]) for array in arrays]).to_numpy()
+        for i in range(arrays[0].shape[1])
+    ])
+
+
+
+# %% 4 -
+print()
+for count in [7, 100, 1000]:
+    arrays = [bars(count, gaps = True)[field] for field in ['CLOSE', 'HIGH', 'LOW', 'VOLUME']]
+
+    total_ta, total_engine = 0.0, 0.0
+    for name, (ta_indicator, engine_indicator) in INDICATORS.items():
+        _, elapsed_ta     = timed(per_column, ta_indicator, arrays)
+        _, elapsed_engine = timed(engine_indicator, *arrays)
+
+        total_ta     += elapsed_ta
+        total_engine += elapsed_engine
+
+        print(f"{count:>5} instruments - {name}: ta {elapsed_ta:8.3f}s - engine {elapsed_engine:8.3f}s")
+
+    print(f"{count:>5} instruments - all: ta {total_ta:8.3f}s - engine {total_engine:8.3f}s - {total_ta / total_engine:6.1f}x")
+    print()
@@ -0,0 +1,60 @@
+"""
+
+new daily bar - recomputing every indicator over the full history against
+updating the online indicator state with just the new bar - and the cost of
+saving and restoring that state between sessions.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import json
+import time
+
+from cowboysmall.data.file import read_master_file
+from cowboysmall.feature.indicators import get_all_indicators
+from cowboysmall.feature.online import Features, State
+
+
+
+# %% 2 -
+REPEATS = 200
+
+
+
+# %% 3 -
+master  = read_master_file()
+history = master.iloc[:-1]
+bar     = master.iloc[-1].to_dict()
+
+features = Features(['NSEI', 'DJI'])
+features.warm(history)
+
+
+
+# %% 4 -
+start = time.perf_counter()
+for _ in range(REPEATS // 20):
+    get_all_indicators(master.copy())
+recompute = (time.perf_counter() - start) / (REPEATS // 20)
+
+start = time.perf_counter()
+for _ in range(REPEATS):
+    State.restore(features.state()).update(bar)
+restore = (time.perf_counter() - start) / REPEATS
+
+start = time.perf_counter()
+for _ in range(REPEATS):
+    features.update(bar)
+update = (time.perf_counter() - start) / REPEATS
+
+
+
+# %% 5 -
+print()
+print(f"  full recompute: {recompute * 1e6:10.1f} us per bar")
+print(f"  online update:  {update * 1e6:10.1f} us per bar - {recompute / update:7.1f}x")
+print(f"  restore/update: {restore * 1e6:10.1f} us per bar")
+print(f"  state size:     {len(json.dumps(features.state())):10d} bytes")
+print()
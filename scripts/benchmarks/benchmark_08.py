@@ -0,0 +1,64 @@
+"""
+
+design matrix - the prelude every phase_03 / phase_04 script repeats,
+read_master_file, target, ratios, indicators, shift and dropna, against
+loading the matrix from the feature store once it has been materialised.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import time
+
+import numpy as np
+import pandas as pd
+
+from cowboysmall.data.file import read_master_file
+from cowboysmall.feature import ALL_COLS
+from cowboysmall.feature.indicators import get_indicators, get_ratios
+from cowboysmall.feature.store import design_matrix
+
+
+
+# %% 2 -
+REPEATS = 20
+
+
+
+# %% 3 -
+def prelude():
+    master = read_master_file()
+
+    master["NSEI_OPEN_DIR"] = np.where(master["NSEI_OPEN"] > master["NSEI_CLOSE"].shift(), 1, 0)
+
+    master = get_ratios(master)
+    master = get_indicators(master)
+
+    data = pd.concat([master["NSEI_OPEN_DIR"].shift(-1), master[ALL_COLS]], axis = 1)
+    data.dropna(inplace = True)
+
+    return data
+
+
+def timed(function, repeats = REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+
+    return result, (time.perf_counter() - start) / repeats
+
+
+
+# %% 4 -
+expected, elapsed_prelude = timed(prelude)
+_,        elapsed_build   = timed(lambda: design_matrix(refresh = True), 1)
+actual,   elapsed_store   = timed(design_matrix)
+
+pd.testing.assert_frame_equal(actual, expected, check_freq = False)
+
+print()
+print(f"  prelude:     {elapsed_prelude * 1000:8.2f} ms")
+print(f"  store build: {elapsed_build * 1000:8.2f} ms")
+print(f"  store load:  {elapsed_store * 1000:8.2f} ms - {elapsed_prelude / elapsed_store:6.1f}x")
+print()
@@ -0,0 +1,66 @@
+"""
+
+window sweeps - RSI 7/14/21/28, SMA and EMA 5-200 and ROC 5-60 - one ta
+call per window per instrument, one engine call per window, and one sweep
+call per indicator that shares its prefix sums and diffs across windows -
+the sweeps are checked against both by tests/test_engine.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import numpy as np
+import pandas as pd
+
+import ta
+
+from cowboysmall.feature import engine
+
+from scripts.benchmarks.common import prices, timed
+
+
+
+# %% 2 -
+SWEEPS = {
+    'RSI': ([7, 14, 21, 28],    ta.momentum.rsi,       engine.rsi,           engine.rsi_sweep),
+    'SMA': (range(5, 201),      ta.trend.sma_indicator, engine.sma_indicator, engine.sma_sweep),
+    'EMA': (range(5, 201),      ta.trend.ema_indicator, engine.ema_indicator, engine.ema_sweep),
+    'ROC': (range(5, 61),       ta.momentum.roc,       engine.roc,           engine.roc_sweep)
+}
+
+
+
+# %% 3 -
+def per_window_ta(indicator, close, windows):
+    return np.stack([
+        np.column_stack([indicator(pd.Series(close[:, i]), window).to_numpy() for i in range(close.shape[1])])
+        for window in windows
+    ], axis = -1)
+
+
+def per_window_engine(indicator, close, windows):
+    return np.stack([indicator(close, window) for window in windows], axis = -1)
+
+
+
+# %% 4 -
+print()
+for count in [7, 100]:
+    close = prices(count)
+
+    for name, (windows, ta_indicator, engine_indicator, sweep) in SWEEPS.items():
+        windows = np.array(list(windows))
+
+        _, elapsed_sweep = timed(sweep, close, windows)
+        _, elapsed_loop  = timed(per_window_engine, engine_indicator, close, windows)
+
+        if count == 7:
+            _, elapsed_ta = timed(per_window_ta, ta_indicator, close, windows)
+
+            reference = f"ta {elapsed_ta:8.3f}s - "
+        else:
+            reference = " " * 16
+
+        print(f"{count:>4} instruments - {name} x {len(windows):>3}: {reference}engine {elapsed_loop:7.3f}s - sweep {elapsed_sweep:7.3f}s")
+    print()
@@ -0,0 +1,69 @@
+"""
+
+rolling max at long windows over multi-decade histories - the window scan
+the engine used to do (O(n.w)), pandas rolling max, and the van Herk /
+Gil-Werman kernel (O(n)) - then the ulcer index and donchian channel
+rebuilt on it against ta - the kernel and the indicators are checked by
+tests/test_engine.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import numpy as np
+import pandas as pd
+
+import ta
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from cowboysmall.feature import engine
+
+from scripts.benchmarks.common import prices, timed
+
+
+
+# %% 2 -
+YEARS = 40
+
+
+
+# %% 3 -
+def window_scan(values, window):
+    padded = np.vstack([np.full((window - 1, values.shape[1]), np.nan), values])
+
+    return np.fmax.reduce(sliding_window_view(padded, window, axis = 0), axis = -1)
+
+
+
+# %% 4 -
+close = prices(100, YEARS * 252)
+
+print()
+for window in [250, 500, 1000, 2500]:
+    _, elapsed_pandas = timed(lambda: pd.DataFrame(close).rolling(window, min_periods = 1).max().to_numpy())
+    _, elapsed_scan   = timed(window_scan, close, window)
+    _, elapsed_engine = timed(engine.rolling_max, close, window, 1)
+
+    print(f"  100 x {len(close)} - window {window:>4}: scan {elapsed_scan:7.3f}s - pandas {elapsed_pandas:7.3f}s - engine {elapsed_engine:7.3f}s")
+print()
+
+
+
+# %% 5 -
+close = prices(7, YEARS * 252)
+high  = close * 1.01
+low   = close * 0.99
+
+for window in [250, 1000]:
+    _, elapsed_ta     = timed(lambda: np.column_stack([ta.volatility.ulcer_index(pd.Series(close[:, i]), window).to_numpy() for i in range(7)]))
+    _, elapsed_engine = timed(engine.ulcer_index, close, window)
+
+    print(f"    7 x {len(close)} - ulcer    {window:>4}: ta {elapsed_ta:7.3f}s - engine {elapsed_engine:7.3f}s")
+
+    _, elapsed_ta     = timed(lambda: np.column_stack([ta.volatility.donchian_channel_pband(pd.Series(high[:, i]), pd.Series(low[:, i]), pd.Series(close[:, i]), window).to_numpy() for i in range(7)]))
+    _, elapsed_engine = timed(engine.donchian_channel_pband, high, low, close, window)
+
+    print(f"    7 x {len(close)} - donchian {window:>4}: ta {elapsed_ta:7.3f}s - engine {elapsed_engine:7.3f}s")
+print()
@@ -0,0 +1,55 @@
+"""
+
+indicator layer across a process pool - instruments sharded over workers
+that read their inputs from, and write their features into, shared memory -
+throughput and scaling against the serial feature graph on a 1000
+instrument universe.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cowboysmall.feature.graph import FEATURES, compute
+from cowboysmall.feature.parallel import compute_parallel
+
+from scripts.benchmarks.common import FIELDS, bars
+
+
+
+# %% 2 -
+blocks      = bars(1000)
+instruments = [f"I{i:04d}" for i in range(1000)]
+
+data    = pd.DataFrame(np.hstack([blocks[field] for field in FIELDS]), columns = [f"{instrument}_{field}" for field in FIELDS for instrument in instruments])
+columns = [f"{instrument}_{name}" for name in FEATURES for instrument in instruments]
+
+
+
+# %% 3 -
+
+start    = time.perf_counter()
+expected = compute(data, columns)
+serial   = time.perf_counter() - start
+
+print()
+print(f"  serial graph:  {serial:7.3f}s - {len(instruments) / serial:8.1f} instruments/s")
+
+for workers in sorted({1, 2, 4, os.cpu_count()}):
+    if workers > os.cpu_count():
+        continue
+
+    start   = time.perf_counter()
+    actual  = compute_parallel(data, instruments, workers = workers)
+    elapsed = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(actual[columns], expected)
+
+    print(f"  {workers:>3} workers:   {elapsed:7.3f}s - {len(instruments) / elapsed:8.1f} instruments/s - {serial / elapsed:5.2f}x")
+print()
@@ -0,0 +1,73 @@
+"""
+
+backward pruning of a logit model - the original loop, which refits from
+scratch and recomputes every variance inflation factor on each pass, against
+the warm started prune, which carries the fit and the inverse information
+matrix over each dropped column - as the number of features grows - the two
+are checked against each other by tests/test_logit.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.api import Logit
+from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+from cowboysmall.model.logit import prune
+
+from scripts.benchmarks.common import logit_data, timed
+
+
+
+# %% 2 -
+ROWS = 5000
+
+
+
+# %% 3 -
+def prune_refit(X, y):
+    dropped = []
+
+    while True:
+        model = Logit(y, X.drop(dropped, axis = 1)).fit(disp = 0)
+
+        insignificant = [(column, value) for column, value in model.pvalues.iloc[1:].items() if value > 0.05]
+        if insignificant:
+            dropped.append(max(insignificant, key = lambda p: p[1])[0])
+            continue
+
+        exog     = model.model.exog
+        colinear = [(column, variance_inflation_factor(exog, i)) for i, column in enumerate(model.model.exog_names) if i > 0]
+        colinear = [(column, vif) for column, vif in colinear if vif > 5]
+        if colinear:
+            dropped.append(max(colinear, key = lambda c: c[1])[0])
+            continue
+
+        return model, dropped
+
+
+
+# %% 4 -
+warnings.simplefilter('ignore')
+
+print()
+for features in [10, 25, 50]:
+    X, y = logit_data(features, ROWS, weights = np.linspace(0.8, 0.2, 5))
+
+    _, elapsed_refit = timed(prune_refit, X, y)
+
+    timings = []
+    (_, actual_dropped), elapsed_prune = timed(prune, X, y, verbose = False, timings = timings)
+
+    iterations = sum(timing['ITERATIONS'] for timing in timings)
+    print(f"  {features:>2} features - {len(actual_dropped):>2} dropped: refit {elapsed_refit:7.3f}s - prune {elapsed_prune:7.3f}s - {elapsed_refit / elapsed_prune:5.1f}x - {iterations} newton iterations")
+print()
+
+print(pd.DataFrame(timings).head(10).to_string(index = False))
+print()
@@ -0,0 +1,90 @@
+"""
+
+variance inflation factors - one auxiliary regression per column with
+statsmodels against the diagonal of the inverse correlation matrix, then a
+full colinearity elimination with the inverse recomputed after each drop
+against the inverse downdated in place - both are checked by
+tests/test_logit.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import numpy as np
+
+from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+from cowboysmall.model.logit import correlation_inverse, downdate, variance_inflation_factors
+
+from scripts.benchmarks.common import timed
+
+
+
+# %% 2 -
+ROWS = 2000
+
+
+
+# %% 3 -
+def synthetic(features, rows = ROWS, seed = 1337):
+    rng = np.random.default_rng(seed)
+
+    # half the columns are noisy copies of the other half
+    X = rng.normal(size = (rows, features))
+    X[:, features // 2:] = X[:, :features - features // 2] + rng.normal(0, 0.3, size = (rows, features - features // 2))
+
+    return np.column_stack([np.ones(rows), X])
+
+
+def eliminate_recomputed(exog, threshold = 5):
+    dropped = 0
+
+    while exog.shape[1] > 2:
+        vifs  = variance_inflation_factors(exog)
+        worst = int(np.argmax(vifs))
+        if vifs[worst] <= threshold:
+            break
+
+        exog     = np.delete(exog, worst + 1, axis = 1)
+        dropped += 1
+
+    return dropped, np.sort(variance_inflation_factors(exog))
+
+
+def eliminate_downdated(exog, threshold = 5):
+    dropped = 0
+    inverse = correlation_inverse(exog)
+
+    while len(inverse) > 1:
+        vifs  = np.diag(inverse)
+        worst = int(np.argmax(vifs))
+        if vifs[worst] <= threshold:
+            break
+
+        inverse  = downdate(inverse, worst)
+        dropped += 1
+
+    return dropped, np.sort(np.diag(inverse))
+
+
+
+# %% 4 -
+print()
+for features in [25, 50, 100, 250]:
+    exog = synthetic(features)
+
+    _, elapsed_statsmodels = timed(lambda: np.array([variance_inflation_factor(exog, i) for i in range(1, exog.shape[1])]))
+    _, elapsed_batched     = timed(variance_inflation_factors, exog)
+
+    print(f"  {features:>3} features - statsmodels {elapsed_statsmodels:7.3f}s - batched {elapsed_batched:7.4f}s - {elapsed_statsmodels / elapsed_batched:7.1f}x")
+print()
+
+for features in [100, 250, 500]:
+    exog = synthetic(features)
+
+    _,      elapsed_recomputed = timed(eliminate_recomputed, exog)
+    actual, elapsed_downdated  = timed(eliminate_downdated, exog)
+
+    print(f"  {features:>3} features - {actual[0]:>3} dropped: recomputed {elapsed_recomputed:7.3f}s - downdated {elapsed_downdated:7.4f}s - {elapsed_recomputed / elapsed_downdated:7.1f}x")
+print()
@@ -0,0 +1,92 @@
+"""
+
+stepwise logit selection by aic, bic and validation auc - the naive loop,
+which refits every candidate submodel from scratch with statsmodels, against
+the selection engine, which fits the candidates of a step concurrently and
+warm starts each of them from the parent fit - the two are checked against
+each other by tests/test_logit.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import os
+import warnings
+
+import numpy as np
+
+from sklearn.metrics import roc_auc_score
+
+from statsmodels.api import Logit
+
+from cowboysmall.model.logit import select
+
+from scripts.benchmarks.common import logit_data, timed
+
+
+
+# %% 2 -
+ROWS = 4000
+
+
+
+# %% 3 -
+def naive_score(X, y, columns, criterion, X_valid, y_valid):
+    model = Logit(y, X[columns]).fit(disp = 0)
+
+    if criterion == 'auc':
+        return -roc_auc_score(y_valid, model.predict(X_valid[columns]))
+
+    return getattr(model, criterion)
+
+
+def naive_select(X, y, criterion, direction, X_valid, y_valid):
+    columns = list(X.columns)
+    current = list(columns) if direction == 'backward' else columns[:1]
+    value   = naive_score(X, y, current, criterion, X_valid, y_valid)
+
+    changed = []
+    while True:
+        if direction == 'backward':
+            options    = current[1:]
+            candidates = [[column for column in current if column != option] for option in options]
+        else:
+            options    = [column for column in columns if column not in current]
+            candidates = [current + [option] for option in options]
+
+        if not candidates:
+            break
+
+        scores = [naive_score(X, y, candidate, criterion, X_valid, y_valid) for candidate in candidates]
+        best   = int(np.argmin(scores))
+        if scores[best] >= value:
+            break
+
+        value   = scores[best]
+        current = candidates[best]
+        changed.append(options[best])
+
+    return changed
+
+
+
+# %% 4 -
+warnings.simplefilter('ignore')
+
+print()
+for features in [10, 25, 50]:
+    X, y  = logit_data(features, ROWS)
+    split = ROWS * 3 // 4
+
+    X_train, y_train, X_valid, y_valid = X.iloc[:split], y.iloc[:split], X.iloc[split:], y.iloc[split:]
+
+    for criterion in ['aic', 'bic', 'auc']:
+        for direction in ['backward', 'forward']:
+            _, elapsed_naive = timed(naive_select, X_train, y_train, criterion, direction, X_valid, y_valid)
+
+            (_, actual), elapsed_serial = timed(select, X_train, y_train, criterion, direction, (X_valid, y_valid), workers = 1, verbose = False)
+            _,           elapsed_pool   = timed(select, X_train, y_train, criterion, direction, (X_valid, y_valid), verbose = False)
+
+            print(f"  {features:>2} features - {criterion} {direction:<8} - {len(actual):>2} steps: naive {elapsed_naive:7.3f}s - serial {elapsed_serial:6.3f}s - {os.cpu_count()} workers {elapsed_pool:6.3f}s - {elapsed_naive / elapsed_pool:5.1f}x")
+    print()
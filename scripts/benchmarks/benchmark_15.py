@@ -0,0 +1,57 @@
+"""
+
+fitting many column subsets of one design - a statsmodels Logit per subset,
+the lean solver one subset at a time, and the lean solver with subsets of a
+size fitted together as a batch - the solver is checked against statsmodels
+by tests/test_solver.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import warnings
+
+import numpy as np
+
+from statsmodels.api import Logit
+
+from cowboysmall.model.solver import fit, fit_batch
+
+from scripts.benchmarks.common import logit_data, timed
+
+
+
+# %% 2 -
+ROWS     = 4000
+FEATURES = 50
+
+
+
+# %% 3 -
+def subsets(count, size, features = FEATURES, seed = 1337):
+    rng = np.random.default_rng(seed)
+
+    return [[0, *sorted(1 + rng.choice(features, size - 1, replace = False))] for _ in range(count)]
+
+
+
+# %% 4 -
+warnings.simplefilter('ignore')
+
+X, y = logit_data(FEATURES, ROWS, copies = False)
+exog = X.to_numpy()
+
+print()
+for count, size in [(500, 5), (500, 10), (200, 25), (50, 50)]:
+    columns = subsets(count, size)
+
+    _,       elapsed_statsmodels = timed(lambda: [Logit(y, X.iloc[:, subset]).fit(disp = 0) for subset in columns])
+    _,       elapsed_single      = timed(lambda: [fit(exog, y, subset) for subset in columns])
+    batched, elapsed_batched     = timed(fit_batch, exog, y, columns)
+
+    print(f"  {count:>3} subsets of {size:>2}: statsmodels {elapsed_statsmodels:7.3f}s - single {elapsed_single:6.3f}s - batched {elapsed_batched:6.3f}s - {elapsed_statsmodels / elapsed_batched:5.1f}x")
+print()
+
+print(batched[0].summary())
+print()
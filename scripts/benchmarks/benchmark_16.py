@@ -0,0 +1,96 @@
+"""
+
+imbalance remedies over a grid of remedies x models x seeds - one
+imbalance_remedy_evaluation call per cell, resampling every time, against
+the grid harness, which spreads the cells over the workers and has each
+worker reuse its latest resample - the two are checked against each other
+by tests/test_imbalance.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from sklearn.tree import DecisionTreeClassifier
+
+from imblearn.over_sampling import RandomOverSampler, SMOTE, ADASYN
+from imblearn.under_sampling import RandomUnderSampler
+
+from cowboysmall.model.imbalance import imbalance_remedy_evaluation, imbalance_remedy_grid, seeded
+
+from scripts.benchmarks.common import timed
+
+
+
+# %% 2 -
+ROWS  = 1500
+SEEDS = [0, 1, 2, 3, 4]
+
+REMEDIES = {
+    'none':               None,
+    'RandomUnderSampler': RandomUnderSampler(),
+    'RandomOverSampler':  RandomOverSampler(),
+    'SMOTE':              SMOTE(),
+    'ADASYN':             ADASYN()
+}
+
+MODELS = {
+    'LogisticRegression':     LogisticRegression(max_iter = 1000),
+    'GaussianNB':             GaussianNB(),
+    'DecisionTreeClassifier': DecisionTreeClassifier(max_depth = 5)
+}
+
+METRICS = ['AUC', 'THRESHOLD', 'ACCURACY', 'SENSITIVITY', 'SPECIFICITY']
+
+
+
+# %% 3 -
+def synthetic(rows = ROWS, seed = 1337):
+    rng = np.random.default_rng(seed)
+
+    # roughly the 68 / 32 split of the nifty open direction
+    X = pd.DataFrame(rng.normal(size = (rows, 6)), columns = [f"X{i}" for i in range(6)])
+    y = pd.Series((rng.random(rows) < 1 / (1 + np.exp(-(0.9 + X.to_numpy() @ np.linspace(1.0, 0.0, 6))))).astype(int), name = 'y')
+
+    return X, y
+
+
+def naive_grid(X, y):
+    rows = []
+
+    for remedy, estimator in REMEDIES.items():
+        for seed in SEEDS:
+            for name, model in MODELS.items():
+                results = imbalance_remedy_evaluation(None if estimator is None else seeded(estimator, seed), seeded(model, seed), X, y, seed)
+                rows.append({'REMEDY': remedy, 'MODEL': name, 'SEED': seed, **results})
+
+    return pd.DataFrame(rows)
+
+
+
+# %% 4 -
+warnings.simplefilter('ignore')
+
+X, y = synthetic()
+
+expected, elapsed_naive  = timed(naive_grid, X, y)
+actual,   elapsed_serial = timed(imbalance_remedy_grid, REMEDIES, MODELS, X, y, SEEDS, workers = 1)
+_,        elapsed_pool   = timed(imbalance_remedy_grid, REMEDIES, MODELS, X, y, SEEDS)
+
+print()
+print(f"  {len(expected)} cells: naive {elapsed_naive:6.3f}s - grid {elapsed_serial:6.3f}s - {os.cpu_count()} workers {elapsed_pool:6.3f}s")
+print()
+
+print(actual.groupby('REMEDY')[['RESAMPLE_SECONDS', 'FIT_SECONDS']].sum().round(3).to_string())
+print()
+
+print(actual.groupby(['REMEDY', 'MODEL'])[METRICS].mean().round(3).to_string())
+print()
@@ -0,0 +1,66 @@
+"""
+
+binary classification metrics over bootstrap replicates - roc_curve,
+roc_auc_score and a pd.crosstab per replicate, as the evaluation scripts do,
+against the metrics module, which scores every replicate in one call from a
+single sort of each - the two are checked against each other by
+tests/test_metrics.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import numpy as np
+import pandas as pd
+
+from sklearn.metrics import roc_curve, roc_auc_score
+
+from cowboysmall.model.metrics import classification_metrics
+
+from scripts.benchmarks.common import scored, timed
+
+
+
+# %% 2 -
+ROWS = 1000
+
+
+
+# %% 3 -
+def crosstab_metrics(y, scores):
+    rows = []
+
+    for score in scores:
+        fpr, tpr, thresholds = roc_curve(y, score)
+
+        threshold = thresholds[np.argmax(tpr - fpr)]
+        table     = pd.crosstab(np.where(score <= threshold, 0, 1), y)
+
+        rows.append([
+            roc_auc_score(y, score),
+            threshold,
+            (table.iloc[0, 0] + table.iloc[1, 1]) / len(y),
+            table.iloc[1, 1] / (table.iloc[0, 1] + table.iloc[1, 1]),
+            table.iloc[0, 0] / (table.iloc[0, 0] + table.iloc[1, 0])
+        ])
+
+    return np.array(rows)
+
+
+
+# %% 4 -
+print()
+for replicates in [10, 100, 1000]:
+    y, scores = scored(replicates, ROWS, decimals = 3)
+
+    _, elapsed_crosstab = timed(crosstab_metrics, y, scores)
+    _, elapsed_metrics  = timed(classification_metrics, y, scores)
+
+    print(f"  {replicates:>4} replicates x {ROWS}: crosstab {elapsed_crosstab:7.3f}s - metrics {elapsed_metrics:7.4f}s - {elapsed_crosstab / elapsed_metrics:6.1f}x")
+print()
+
+# a replicate that never predicts the positive class
+y, scores = scored(1, ROWS, decimals = 3)
+print(classification_metrics(y, scores[0], threshold = 1.0))
+print()
@@ -0,0 +1,54 @@
+"""
+
+roc curves for a matrix of scores - roc_curve, roc_auc_score, the youden
+threshold and a re-threshold with np.where per row, as the phase 4 script
+does for each classifier, against one call of the roc engine, which sorts
+each row once - for seven classifiers and for bootstrap replicates - the two
+are checked against each other by tests/test_metrics.py.
+
+"""
+
+
+
+# %% 1 - import required libraries
+import numpy as np
+
+from sklearn.metrics import roc_curve, roc_auc_score
+
+from cowboysmall.model.metrics import roc
+
+from scripts.benchmarks.common import scored, timed
+
+
+
+# %% 2 -
+ROWS = 1220
+
+
+
+# %% 3 -
+def per_row(y, scores):
+    rows = []
+
+    for score in scores:
+        fpr, tpr, thresholds = roc_curve(y, score)
+
+        threshold = round(thresholds[np.argmax(tpr - fpr)], 3)
+        predicted = np.where(score <= threshold, 0, 1)
+
+        rows.append((fpr, tpr, thresholds, roc_auc_score(y, score), threshold, np.mean(predicted == y)))
+
+    return rows
+
+
+
+# %% 4 -
+print()
+for label, models in [('classifiers', 7), ('replicates', 1000)]:
+    y, scores = scored(models, ROWS, separation = (0.05, 0.3))
+
+    _, elapsed_rows = timed(per_row, y, scores)
+    _, elapsed_roc  = timed(roc, y, scores, decimals = 3)
+
+    print(f"  {models:>4} {label:<11} x {ROWS}: per row {elapsed_rows:7.3f}s - roc {elapsed_roc:7.4f}s - {elapsed_rows / elapsed_roc:6.1f}x")
+print()
@@ -0,0 +1,113 @@
+"""
+
+helpers shared by the benchmarks - timing, synthetic market data and
+classification problems, and a local stand-in for yfinance.download - run
+the benchmarks from the repository root, e.g.
+
+    python -m scripts.benchmarks.benchmark_09
+
+"""
+
+
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+
+FIELDS = ['OPEN', 'HIGH', 'LOW', 'CLOSE', 'VOLUME']
+
+
+
+def timed(function, *args, **kwargs):
+    start  = time.perf_counter()
+    result = function(*args, **kwargs)
+
+    return result, time.perf_counter() - start
+
+
+
+def bars(count, length = 1500, seed = 1337, gaps = False):
+    rng   = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size = (length, count)), axis = 0))
+
+    # staggered listings, and the odd missing bar on a few instruments
+    if gaps:
+        for i in range(count):
+            close[:rng.integers(0, 50), i] = np.nan
+        close[rng.integers(50, length, size = 3), ::20] = np.nan
+
+    return {
+        'OPEN':   close * (1 + rng.normal(0, 0.002, size = close.shape)),
+        'HIGH':   close * (1 + rng.uniform(0, 0.02, size = close.shape)),
+        'LOW':    close * (1 - rng.uniform(0, 0.02, size = close.shape)),
+        'CLOSE':  close,
+        'VOLUME': rng.integers(100000, 1000000, size = close.shape).astype('float64')
+    }
+
+
+def prices(count, length = 1500, seed = 1337):
+    return bars(count, length, seed)['CLOSE']
+
+
+
+def logit_data(features, rows, seed = 1337, weights = np.linspace(0.8, 0.1, 5), copies = True):
+    rng = np.random.default_rng(seed)
+
+    # a handful of informative columns, optionally a few near copies of them, the rest noise
+    X = rng.normal(size = (rows, features))
+    if copies:
+        X[:, 5:10] = X[:, :5] + rng.normal(0, 0.3, size = (rows, 5))
+
+    linear = 0.2 + X[:, :5] @ weights
+    y      = pd.Series((rng.random(rows) < 1 / (1 + np.exp(-linear))).astype(int))
+
+    X = pd.DataFrame(X, columns = [f"X{i:02d}" for i in range(features)])
+    X.insert(0, 'Intercept', 1.0)
+
+    return X, y
+
+
+def scored(count, rows, seed = 1337, separation = 0.2, decimals = None):
+    rng = np.random.default_rng(seed)
+
+    # roughly the 68 / 32 split of the nifty open direction, one row of scores
+    # per model or replicate - a (low, high) separation varies it by row
+    y      = (rng.random(rows) < 0.68).astype(int)
+    shift  = rng.uniform(*separation, size = (count, 1)) if isinstance(separation, tuple) else separation
+    scores = np.clip(0.5 + shift * (y - 0.5) + rng.normal(0, 0.25, size = (count, rows)), 0, 1)
+
+    return y, scores if decimals is None else scores.round(decimals)
+
+
+
+def stand_in(latency, failures, seed = 1337):
+    rng  = np.random.default_rng(seed)
+    lock = threading.Lock()
+
+    def download(ticker, start_date, end_date, progress = False):
+        with lock:
+            fail  = rng.random() < failures
+            noise = rng.normal(0, 0.01, size = 4096)
+
+        time.sleep(latency)
+
+        if fail:
+            raise ConnectionError(f"transient failure retrieving {ticker}")
+
+        dates = pd.bdate_range(start_date, end_date, name = 'Date')
+        close = 100 * np.cumprod(1 + noise[:len(dates)])
+
+        return pd.DataFrame({
+            'Open':      close,
+            'High':      close * 1.01,
+            'Low':       close * 0.99,
+            'Close':     close,
+            'Adj Close': close,
+            'Volume':    np.full(len(dates), 1000)
+        }, index = dates)
+
+    return download
@@ -18,7 +18,8 @@ Global market indices of interest:
 # %% 1 - import required libraries
 from cowboysmall.feature import INDICES, COLUMNS
 
-from cowboysmall.data.index import retrieve_data
+from cowboysmall.data.cache import Cache
+from cowboysmall.data.index import retrieve_many
 from cowboysmall.data.file import save_master_file
 from cowboysmall.data.master import merge_data
 
@@ -28,12 +29,16 @@ from cowboysmall.si.tests import test_normality
 
 
 # %% 2 - retrieve data for indices
+retrieved, failed = retrieve_many(INDICES, cache = Cache())
+
+if failed:
+    raise RuntimeError(f"failed to retrieve {failed}")
+
 data = []
 
 for index, column in zip(INDICES, COLUMNS):
-    retrieved = retrieve_data(index)
-    test_normality(retrieved, column, index)
-    data.append(retrieved)
+    test_normality(retrieved[index], column, index)
+    data.append(retrieved[index])
 
 
 
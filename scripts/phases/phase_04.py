@@ -19,7 +19,7 @@ Global market indices of interest:
 import pandas as pd
 import numpy as np
 
-from sklearn.metrics import classification_report, roc_curve, roc_auc_score
+from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.naive_bayes import GaussianNB
@@ -33,6 +33,7 @@ from sklearn.preprocessing import MinMaxScaler, StandardScaler
 from cowboysmall.data.file import read_master_file
 from cowboysmall.feature import ALL_COLS
 from cowboysmall.feature.indicators import get_indicators, get_ratios
+from cowboysmall.model.metrics import roc
 from cowboysmall.plots import plt, sns
 
 
@@ -79,28 +80,38 @@ X_train, X_test, y_train, y_test = train_test_split(X, y, test_size = 0.2, rando
 
 
 # %% 4 -
+def confusion_table(table):
+    # predicted class down the rows, actual class across, as pd.crosstab laid it out
+    return pd.DataFrame(table, index = pd.Index([0, 1], name = 'predicted'), columns = pd.Index([0, 1], name = 'actual'))
+
+
 def model_metrics(X_train, X_test, y_train, y_test, model, description):
     model.fit(X_train, y_train)
 
     y_train_pred_prob = model.predict_proba(X_train)
-    train_fpr, train_tpr, train_thresholds = roc_curve(y_train, y_train_pred_prob[:, 1])
+    y_test_pred_prob  = model.predict_proba(X_test)
 
-    y_test_pred_prob = model.predict_proba(X_test)
-    test_fpr, test_tpr, _ = roc_curve(y_test, y_test_pred_prob[:, 1])
+    # the cut-off comes from the training curve and is applied to both
+    train = roc(y_train, y_train_pred_prob[:, 1], decimals = 3)
+    test  = roc(y_test, y_test_pred_prob[:, 1], threshold = train['THRESHOLD'])
 
-    optimal_threshold  = round(train_thresholds[np.argmax(train_tpr - train_fpr)], 3)
+    optimal_threshold  = train['THRESHOLD']
 
-    train_auc_roc      = round(roc_auc_score(y_train, y_train_pred_prob[:, 1]), 3)
+    train_fpr          = train['FPR']
+    train_tpr          = train['TPR']
+    train_auc_roc      = round(train['AUC'], 3)
     y_train_pred_class = np.where(y_train_pred_prob[:, 1] <= optimal_threshold,  0, 1)
-    train_table        = pd.crosstab(y_train_pred_class, y_train)
-    train_sensitivity  = round((train_table.iloc[1, 1] / (train_table.iloc[0, 1] + train_table.iloc[1, 1])) * 100, 2)
-    train_specificity  = round((train_table.iloc[0, 0] / (train_table.iloc[0, 0] + train_table.iloc[1, 0])) * 100, 2)
+    train_table        = confusion_table(train['TABLE'])
+    train_sensitivity  = round(train['SENSITIVITY'] * 100, 2)
+    train_specificity  = round(train['SPECIFICITY'] * 100, 2)
 
-    test_auc_roc      = round(roc_auc_score(y_test, y_test_pred_prob[:, 1]), 3)
+    test_fpr          = test['FPR']
+    test_tpr          = test['TPR']
+    test_auc_roc      = round(test['AUC'], 3)
     y_test_pred_class = np.where(y_test_pred_prob[:, 1] <= optimal_threshold,  0, 1)
-    test_table        = pd.crosstab(y_test_pred_class, y_test)
-    test_sensitivity  = round((test_table.iloc[1, 1] / (test_table.iloc[0, 1] + test_table.iloc[1, 1])) * 100, 2)
-    test_specificity  = round((test_table.iloc[0, 0] / (test_table.iloc[0, 0] + test_table.iloc[1, 0])) * 100, 2)
+    test_table        = confusion_table(test['TABLE'])
+    test_sensitivity  = round(test['SENSITIVITY'] * 100, 2)
+    test_specificity  = round(test['SPECIFICITY'] * 100, 2)
 
     plt.roc_curve(train_fpr, train_tpr, f"{description} - Train Data")
     plt.roc_curve(test_fpr, test_tpr, f"{description} - Test Data")
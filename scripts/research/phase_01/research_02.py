@@ -16,12 +16,17 @@ Global market indices of interest:
 
 
 # %% 1 - import required libraries
-from cowboysmall.data.index import retrieve_data
+from cowboysmall.data.index import retrieve_many
 from cowboysmall.data.file import save_index_file
 from cowboysmall.feature import INDICES
 
 
 
 # %% 2 - retrieve data for indices
-for index in INDICES:
-    save_index_file(retrieve_data(index), index)
+retrieved, failed = retrieve_many(INDICES)
+
+for index, data in retrieved.items():
+    save_index_file(data, index)
+
+for index, error in failed.items():
+    print(f"failed to retrieve {index}: {error}")
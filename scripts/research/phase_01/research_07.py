@@ -0,0 +1,38 @@
+
+"""
+
+Global market indices of interest:
+
+    NSEI:  Nifty 50
+    DJI:   Dow Jones Index
+    IXIC:  Nasdaq
+    HSI:   Hang Seng
+    N225:  Nikkei 225
+    GDAXI: Dax
+    VIX:   Volatility Index
+
+"""
+
+
+
+# %% 1 - import required libraries
+import pandas as pd
+
+from cowboysmall.data.file import read_index_tail, append_index_file, read_index_file, read_master_tail, append_master_file
+from cowboysmall.data.index import retrieve_update
+from cowboysmall.data.master import extend_data
+from cowboysmall.feature import INDICES
+
+
+
+# %% 2 - retrieve and append only the bars after the last stored date
+for index in INDICES:
+    print(f"{index.rjust(5)}: {len(append_index_file(retrieve_update(index, read_index_tail(index)), index))} new row(s)")
+
+
+
+# %% 3 - extend the master data with every raw row after its last date, not only the new ones
+last = read_master_tail()
+data = [read_index_file(index, start = last.index[-1] + pd.Timedelta(days = 1)) for index in INDICES]
+
+print(f"master: {len(append_master_file(extend_data(last, data)))} new row(s)")
@@ -16,14 +16,14 @@ Global market indices of interest:
 
 
 # %% 1 - import required libraries
-from cowboysmall.data.file import read_master_file
+from cowboysmall.data.file import map_master_file
 from cowboysmall.plots import plt, sns
 from cowboysmall.feature import COLUMNS
 
 
 
 # %% 2 -
-master = read_master_file()[COLUMNS[:-1]]
+master = map_master_file(columns = COLUMNS[:-1])
 
 
 # %% 2 -
@@ -0,0 +1,116 @@
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+
+CACHE_DIR      = os.environ.get("COWBOYSMALL_CACHE", "./data/cache")
+SCHEMA_VERSION = 1
+
+
+
+class Cache:
+
+    def __init__(self, folder = CACHE_DIR, ttl = None, max_bytes = 256 * 1024 ** 2, offline = False):
+        self.folder    = folder
+        self.ttl       = ttl
+        self.max_bytes = max_bytes
+        self.offline   = offline
+
+        self.hits   = 0
+        self.misses = 0
+        self.lock   = threading.Lock()
+
+        os.makedirs(folder, exist_ok = True)
+        self.entries = self.read_entries()
+
+    def read_entries(self):
+        if not os.path.exists(os.path.join(self.folder, "entries.json")):
+            return {}
+
+        with open(os.path.join(self.folder, "entries.json")) as file:
+            entries = json.load(file)
+
+        return {key: entry for key, entry in entries.items() if os.path.exists(self.file(key))}
+
+    def write_entries(self):
+        with open(os.path.join(self.folder, "entries.json.tmp"), "w") as file:
+            json.dump(self.entries, file, indent = 4)
+
+        os.replace(os.path.join(self.folder, "entries.json.tmp"), os.path.join(self.folder, "entries.json"))
+
+    def key(self, index, start_date, end_date):
+        # an open ended request runs up to today, so its key is pinned to today -
+        # otherwise it would be served the same data forever
+        end_date = pd.Timestamp.today() if end_date is None else end_date
+        dates    = [None if date is None else pd.Timestamp(date).date().isoformat() for date in (start_date, end_date)]
+
+        return hashlib.sha256(json.dumps([index, *dates, SCHEMA_VERSION]).encode()).hexdigest()
+
+    def file(self, key):
+        return os.path.join(self.folder, f"{key}.pkl.gz")
+
+    def expired(self, entry, now):
+        return self.ttl is not None and now - entry['created'] > self.ttl
+
+    def get(self, key):
+        with self.lock:
+            now   = time.time()
+            entry = self.entries.get(key)
+
+            # offline, a stale entry is better than no entry at all
+            if entry is None or (self.expired(entry, now) and not self.offline):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            entry['accessed'] = now
+            self.write_entries()
+
+        return pd.read_pickle(self.file(key), compression = 'gzip')
+
+    def put(self, key, data):
+        data.to_pickle(self.file(key), compression = 'gzip')
+
+        with self.lock:
+            now = time.time()
+            self.entries[key] = {'created': now, 'accessed': now, 'size': os.path.getsize(self.file(key))}
+            self.evict(now)
+            self.write_entries()
+
+        return data
+
+    def evict(self, now):
+        for key in [key for key, entry in self.entries.items() if self.expired(entry, now)]:
+            self.remove(key)
+
+        total = sum(entry['size'] for entry in self.entries.values())
+        for key in sorted(self.entries, key = lambda key: self.entries[key]['accessed']):
+            if total <= self.max_bytes:
+                break
+
+            total -= self.entries[key]['size']
+            self.remove(key)
+
+    def remove(self, key):
+        del self.entries[key]
+
+        if os.path.exists(self.file(key)):
+            os.remove(self.file(key))
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+
+            return {
+                'hits':     self.hits,
+                'misses':   self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries':  len(self.entries),
+                'bytes':    sum(entry['size'] for entry in self.entries.values())
+            }
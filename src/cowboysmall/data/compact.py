@@ -0,0 +1,58 @@
+
+import numpy as np
+import pandas as pd
+
+from cowboysmall.feature import ALL_INDICATORS
+
+
+
+CALENDAR = {'MONTH': 'int8', 'QUARTER': 'int8', 'YEAR': 'int16'}
+
+
+
+def compact_column(values, name, rtol = 1e-6):
+    if name in CALENDAR:
+        return values.astype(CALENDAR[name])
+
+    if name.endswith('_VOLUME'):
+        # whole numbers stay whole - missing values no longer force a float column
+        return values.round().astype('Int64') if np.allclose(values.dropna(), values.dropna().round()) else values
+
+    if values.dtype == 'float64':
+        downcast = values.astype('float32')
+        if np.allclose(downcast.astype('float64'), values, rtol = rtol, atol = 0, equal_nan = True):
+            return downcast
+
+    return values
+
+
+def compact_dtypes(data, rtol = 1e-6):
+    return pd.DataFrame({column: compact_column(data[column], column, rtol) for column in data.columns}, index = data.index)
+
+
+def memory_savings(before, after):
+    table = pd.DataFrame({
+        'DTYPE':  after.dtypes.astype(str),
+        'BEFORE': before.memory_usage(index = False, deep = True),
+        'AFTER':  after.memory_usage(index = False, deep = True)
+    })
+
+    table['SAVED'] = table['BEFORE'] - table['AFTER']
+    table['RATIO'] = (table['AFTER'] / table['BEFORE']).round(3)
+
+    return table
+
+
+def audit_precision(data, compact, features, columns = ALL_INDICATORS, rtol = 1e-4, atol = 1e-6):
+    expected = features(data.copy())[columns]
+    actual   = features(compact.astype({column: 'float64' for column in compact.columns if column.endswith('_VOLUME')}))[columns]
+
+    table = pd.DataFrame(index = columns)
+    table['MAX_ABS_ERROR'] = (actual.astype('float64') - expected).abs().max()
+    table['MAX_REL_ERROR'] = ((actual.astype('float64') - expected).abs() / expected.abs().where(expected != 0)).max()
+    table['WITHIN']        = [
+        np.allclose(actual[column].astype('float64'), expected[column], rtol = rtol, atol = atol, equal_nan = True)
+        for column in columns
+    ]
+
+    return table
@@ -1,37 +1,68 @@
 
-import pandas as pd
+from cowboysmall.data.compact import compact_dtypes
+from cowboysmall.data.partition import read_partitioned, write_partitioned
+from cowboysmall.data.store import append_frame, build_frame, map_frame, read_frame, read_tail, write_frame
+from cowboysmall.feature import INDICES
 
 
 
-def read_index_file(name, indicators = False):
-    data = pd.read_csv(f"./data/raw/{name}.csv", index_col = 'Date')
-
-    data.index = pd.to_datetime(data.index)
+def read_index_file(name, indicators = False, backend = None, columns = None, start = None, end = None, compact = False):
+    data = read_frame(f"./data/raw/{name}", backend = backend, columns = columns, start = start, end = end)
 
     if indicators:
         data['MONTH']   = data.index.month
         data['QUARTER'] = data.index.quarter
         data['YEAR']    = data.index.year
 
-    return data
+    return compact_dtypes(data) if compact else data
+
+
+def save_index_file(data, name, backend = None):
+    return write_frame(data, f"./data/raw/{name}", backend = backend)
+
+
+def read_index_tail(name, rows = 1, backend = None):
+    return read_tail(f"./data/raw/{name}", rows = rows, backend = backend)
+
+
+def append_index_file(data, name, backend = None):
+    return append_frame(data, f"./data/raw/{name}", backend = backend)
+
+
+def build_index_file(name):
+    return build_frame(f"./data/raw/{name}")
+
+
+
+def read_master_file(backend = None, columns = None, start = None, end = None, compact = False):
+    data = read_frame("./data/processed/master_data", backend = backend, columns = columns, start = start, end = end)
+
+    return compact_dtypes(data) if compact else data
+
+
+def save_master_file(data, backend = None):
+    return write_frame(data, "./data/processed/master_data", backend = backend)
+
 
+def read_master_tail(rows = 1, backend = None):
+    return read_tail("./data/processed/master_data", rows = rows, backend = backend)
 
-def save_index_file(data, name):
-    data.to_csv(f"./data/raw/{name}.csv")
 
-    return data
+def append_master_file(data, backend = None):
+    return append_frame(data, "./data/processed/master_data", backend = backend)
 
 
+def build_master_file():
+    return build_frame("./data/processed/master_data")
 
-def read_master_file():
-    data = pd.read_csv("./data/processed/master_data.csv", index_col = 'Date')
 
-    data.index = pd.to_datetime(data.index)
+def map_master_file(columns = None, start = None, end = None):
+    return map_frame("./data/processed/master_data", columns = columns, start = start, end = end)
 
-    return data
 
+def read_partitioned_master_file(indices = INDICES, start = None, end = None, backend = None):
+    return read_partitioned("./data/partitioned/master_data", indices = indices, start = start, end = end, backend = backend)
 
-def save_master_file(data):
-    data.to_csv("./data/processed/master_data.csv")
 
-    return data
+def save_partitioned_master_file(data, indices = INDICES, backend = None):
+    return write_partitioned(data, "./data/partitioned/master_data", indices, backend = backend)
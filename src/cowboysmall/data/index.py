@@ -1,10 +1,41 @@
 
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 import yfinance as yf
 
 
 
-def retrieve_data(index, start_date = '2017-12-1', end_date = '2024-1-31', progress = False):
-    data = yf.download(f'^{index}', start_date, end_date, progress = progress)
+RATE_LIMITS = {'yahoo': 2.0}
+
+
+
+class RateLimiter:
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next     = time.monotonic()
+        self.lock     = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now       = time.monotonic()
+            wait      = self.next - now
+            self.next = max(now, self.next) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+LIMITERS = {source: RateLimiter(rate) for source, rate in RATE_LIMITS.items()}
+
+
+
+def download_data(index, start_date, end_date, progress = False, download = None):
+    data = (download or yf.download)(f'^{index}', start_date, end_date, progress = progress)
 
     data['Daily Returns'] = data.Close.pct_change() * 100
 
@@ -12,3 +43,90 @@ def retrieve_data(index, start_date = '2017-12-1', end_date = '2024-1-31', progr
     data.columns = [f"{index}_{column}" for column in data.columns]
 
     return data
+
+
+def lookup_data(index, start_date, end_date, cache):
+    key  = cache.key(index, start_date, end_date)
+    data = cache.get(key)
+
+    if data is None and cache.offline:
+        raise KeyError(f"{index} from {start_date} to {end_date} is not cached and the cache is offline")
+
+    return key, data
+
+
+def retrieve_data(index, start_date = '2017-12-1', end_date = '2024-1-31', progress = False, download = None, cache = None):
+    if cache is None:
+        return download_data(index, start_date, end_date, progress, download)
+
+    key, data = lookup_data(index, start_date, end_date, cache)
+    if data is not None:
+        return data
+
+    data = download_data(index, start_date, end_date, progress, download)
+
+    return cache.put(key, data) if not data.empty else data
+
+
+def retrieve_update(index, last, end_date = None, download = None, cache = None):
+    start_date = (last.index[-1] + pd.Timedelta(days = 1)).strftime('%Y-%m-%d')
+
+    data = retrieve_data(index, start_date, end_date, download = download, cache = cache)
+    data = data[data.index > last.index[-1]].copy()
+
+    # only the first new row needs the stored history - its return is relative to the last stored close
+    if not data.empty:
+        close = data[f"{index}_CLOSE"].iloc[0]
+        data.loc[data.index[0], f"{index}_DAILY_RETURNS"] = (close / last[f"{index}_CLOSE"].iloc[-1] - 1) * 100
+
+    return data
+
+
+def rate_limited(download, limiter):
+    def limited(*args, **kwargs):
+        limiter.acquire()
+
+        return download(*args, **kwargs)
+
+    return limited
+
+
+def retrieve_with_retries(index, start_date, end_date, retries, backoff, download, cache):
+    # one cache lookup per request - the retries only repeat the download
+    key, data = lookup_data(index, start_date, end_date, cache) if cache is not None else (None, None)
+    if data is not None:
+        return data
+
+    for attempt in range(retries + 1):
+        try:
+            data = download_data(index, start_date, end_date, download = download)
+            if data.empty:
+                raise ValueError(f"no data returned for {index}")
+
+            return cache.put(key, data) if cache is not None else data
+
+        except Exception:
+            if attempt == retries:
+                raise
+
+            time.sleep(backoff * 2 ** attempt)
+
+
+def retrieve_many(indices, start_date = '2017-12-1', end_date = '2024-1-31', workers = 8, source = 'yahoo', retries = 3, backoff = 1.0, download = None, cache = None):
+    limiter  = LIMITERS.setdefault(source, RateLimiter(RATE_LIMITS.get(source, 2.0)))
+    download = rate_limited(download or yf.download, limiter)
+
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        futures = {
+            index: executor.submit(retrieve_with_retries, index, start_date, end_date, retries, backoff, download, cache)
+            for index in indices
+        }
+
+    retrieved, failed = {}, {}
+    for index, future in futures.items():
+        if future.exception():
+            failed[index] = future.exception()
+        else:
+            retrieved[index] = future.result()
+
+    return retrieved, failed
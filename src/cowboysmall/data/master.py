@@ -1,15 +1,79 @@
 
+import numpy as np
 import pandas as pd
 
+from cowboysmall.data.compact import compact_dtypes
+from cowboysmall.data.store import row_range
 
 
-def merge_data(data, start_date = '2018-01-02', end_date = '2023-12-29'):
-    merged = pd.concat(data, axis = 1)
 
-    merged.ffill(inplace = True)
+MAX_GAP = 5
+
+
+
+def forward_positions(values):
+    # row of the last non-missing value at or before each row, or -1 if there is none yet
+    return np.maximum.accumulate(np.where(np.isnan(values), -1, np.arange(len(values))))
+
+
+def seed_row(values, lower):
+    # walk back from the window just far enough to find a value to carry forward
+    step = 1
+    while lower - step > 0 and np.isnan(values[lower - step:lower]).all():
+        step *= 2
+
+    return max(lower - step, 0)
+
+
+def merge_data(data, start_date = '2018-01-02', end_date = '2023-12-29', compact = False):
+    data   = [frame if frame.index.is_monotonic_increasing else frame.sort_index() for frame in data]
+    dates  = [frame.index.values.astype('datetime64[ns]').view('int64') for frame in data]
+    ranges = [row_range(index, start_date, end_date) for index in dates]
+
+    # the window is applied first - only dates inside it ever make it into the output
+    merged = np.unique(np.concatenate([index[lower:upper] for index, (lower, upper) in zip(dates, ranges)]))
+    values = np.full((len(merged), sum(frame.shape[1] for frame in data)), np.nan)
+
+    column = 0
+    for frame, index, (lower, upper) in zip(data, dates, ranges):
+        positions = np.searchsorted(index[:upper], merged, side = 'right') - 1
+
+        for name in frame.columns:
+            series = frame[name].to_numpy()
+            seed   = seed_row(series, lower)
+
+            if upper > seed:
+                block = series[seed:upper].astype('float64')
+                rows  = np.where(positions >= seed, forward_positions(block)[positions - seed], -1)
+                values[:, column] = np.where(rows >= 0, block[rows], np.nan)
+
+            column += 1
+
+    merged = pd.DataFrame(
+        values,
+        index   = pd.DatetimeIndex(merged.view('datetime64[ns]'), name = data[0].index.name),
+        columns = [column for frame in data for column in frame.columns],
+        copy    = False
+    )
 
     merged['MONTH']   = merged.index.month
     merged['QUARTER'] = merged.index.quarter
     merged['YEAR']    = merged.index.year
 
-    return merged[start_date:end_date]
+    return compact_dtypes(merged) if compact else merged
+
+
+def extend_data(last, data, end_date = None):
+    after = last.index[-1] + pd.Timedelta(1, 'ns')
+
+    # the last stored row seeds the forward fill, exactly as it would in a full merge
+    seeded = [pd.concat([last[frame.columns], frame[frame.index >= after]]) for frame in data]
+
+    extended = merge_data(seeded, start_date = after, end_date = end_date)[last.columns]
+
+    # across every index a week of business days without a bar means rows were left out
+    dates = last.index[-1:].append(extended.index).values.astype('datetime64[D]')
+    if (np.busday_count(dates[:-1], dates[1:]) > MAX_GAP).any():
+        raise ValueError(f"extended data leaves a gap after {last.index[-1].date()}")
+
+    return extended
@@ -0,0 +1,123 @@
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from cowboysmall.data.store import read_frame, write_frame
+
+
+
+def partition_folder(root, index, year):
+    return os.path.join(root, f"index={index}", f"year={year}")
+
+
+def partition_hash(data):
+    content = pd.util.hash_pandas_object(data, index = True).values.tobytes()
+
+    return hashlib.sha256(content + repr(list(data.columns)).encode()).hexdigest()
+
+
+def order_file(root):
+    return os.path.join(root, "indices.json")
+
+
+def read_order(root):
+    if not os.path.exists(order_file(root)):
+        return None
+
+    with open(order_file(root)) as file:
+        return json.load(file)
+
+
+def write_order(root, indices):
+    with open(f"{order_file(root)}.tmp", "w") as file:
+        json.dump(indices, file)
+
+    os.replace(f"{order_file(root)}.tmp", order_file(root))
+
+
+def list_partitions(root, indices = None, start = None, end = None):
+    lower = None if start is None else pd.Timestamp(start).year
+    upper = None if end is None else pd.Timestamp(end).year
+
+    partitions = []
+    for folder in sorted(glob.glob(os.path.join(root, "index=*", "year=*"))):
+        index = os.path.basename(os.path.dirname(folder))[len("index="):]
+        year  = int(os.path.basename(folder)[len("year="):])
+
+        if indices is not None and index not in indices:
+            continue
+
+        if (lower is not None and year < lower) or (upper is not None and year > upper):
+            continue
+
+        partitions.append((index, year, folder))
+
+    return partitions
+
+
+
+def write_partitioned(data, root, indices, backend = None):
+    written = []
+    current = {}
+
+    for index in indices:
+        columns = [column for column in data.columns if column.startswith(f"{index}_")]
+        if not columns:
+            continue
+
+        for year, frame in data[columns].groupby(data.index.year):
+            folder = partition_folder(root, index, year)
+            current[folder] = index
+            digest = partition_hash(frame)
+
+            if os.path.exists(os.path.join(folder, "hash")):
+                with open(os.path.join(folder, "hash")) as file:
+                    if file.read() == digest:
+                        continue
+
+            os.makedirs(folder, exist_ok = True)
+            write_frame(frame, os.path.join(folder, "data"), backend = backend)
+
+            with open(os.path.join(folder, "hash"), "w") as file:
+                file.write(digest)
+
+            written.append((index, year))
+
+    # the indices in the order they were written, for readers that ask for all of them
+    os.makedirs(root, exist_ok = True)
+    write_order(root, list(dict.fromkeys(current.values())))
+
+    # the new frame replaces the old one, so years and indices it no longer has go
+    for _, _, folder in list_partitions(root):
+        if folder not in current:
+            shutil.rmtree(folder)
+
+    for folder in glob.glob(os.path.join(root, "index=*")):
+        if not os.listdir(folder):
+            os.rmdir(folder)
+
+    return written
+
+
+def read_partitioned(root, indices = None, start = None, end = None, backend = None):
+    frames = {}
+
+    for index, _, folder in list_partitions(root, indices, start, end):
+        frames.setdefault(index, []).append(read_frame(os.path.join(folder, "data"), backend = backend, start = start, end = end))
+
+    if not frames:
+        data = pd.DataFrame(index = pd.DatetimeIndex([], name = 'Date'))
+    else:
+        order = indices if indices is not None else read_order(root) or list(frames)
+        data  = pd.concat([pd.concat(frames[index]) for index in order if index in frames], axis = 1, sort = True)
+
+    data['MONTH']   = data.index.month
+    data['QUARTER'] = data.index.quarter
+    data['YEAR']    = data.index.year
+
+    return data
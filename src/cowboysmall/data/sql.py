@@ -0,0 +1,105 @@
+
+import sqlite3
+
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+
+DATABASE = "./data/processed/master_data.sqlite"
+
+AGGREGATES = {'count': 'COUNT', 'mean': 'AVG', 'sum': 'SUM', 'min': 'MIN', 'max': 'MAX'}
+
+
+
+@contextmanager
+def connect(database):
+    connection = sqlite3.connect(database)
+
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table_columns(connection, table):
+    columns = [row[1] for row in connection.execute(f"PRAGMA table_info({quote(table)})")]
+
+    if not columns:
+        raise ValueError(f"table {table} does not exist")
+
+    return columns
+
+
+def checked(connection, table, *names):
+    columns = table_columns(connection, table)
+
+    for name in names:
+        if name not in columns:
+            raise ValueError(f"column {name} does not exist in table {table}")
+
+    return [quote(name) for name in names]
+
+
+
+def ingest(data, database = DATABASE, table = 'master', indexes = ('YEAR', 'QUARTER', 'MONTH')):
+    data = data.copy()
+
+    # categories are stored as their labels
+    for column in data.select_dtypes('category').columns:
+        data[column] = data[column].astype(str)
+
+    with connect(database) as connection:
+        data.to_sql(table, connection, if_exists = 'replace', index = True, index_label = 'Date')
+
+        for column in ['Date', *[column for column in indexes if column in data.columns], *data.select_dtypes('object').columns]:
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {quote(f'{table}_{column}')} ON {quote(table)} ({quote(column)})")
+
+    return data
+
+
+def query(sql, parameters = (), database = DATABASE):
+    with connect(database) as connection:
+        return pd.read_sql_query(sql, connection, params = parameters)
+
+
+def summary(column, group_by, database = DATABASE, table = 'master'):
+    with connect(database) as connection:
+        value, group = checked(connection, table, column, group_by)
+
+        # variance in two passes - the single pass sum of squares loses precision on large values
+        result = pd.read_sql_query(f"""
+            SELECT t.{group} AS {group}, COUNT(t.{value}) AS count, m.mean AS mean,
+                   SUM((t.{value} - m.mean) * (t.{value} - m.mean)) / (COUNT(t.{value}) - 1) AS var
+            FROM {quote(table)} t
+            JOIN (SELECT {group}, AVG({value}) AS mean FROM {quote(table)} GROUP BY {group}) m ON t.{group} IS m.{group}
+            GROUP BY t.{group}
+            ORDER BY t.{group}
+        """, connection)
+
+    result['std'] = np.sqrt(result['var'])
+
+    return result.set_index(group_by)[['count', 'mean', 'std', 'var']]
+
+
+def pivot(column, index, columns = 'QUARTER', aggfunc = 'mean', database = DATABASE, table = 'master'):
+    if aggfunc not in AGGREGATES:
+        raise ValueError(f"aggfunc must be one of {', '.join(AGGREGATES)}")
+
+    with connect(database) as connection:
+        value, rows, cols = checked(connection, table, column, index, columns)
+
+        result = pd.read_sql_query(f"""
+            SELECT {rows} AS {rows}, {cols} AS {cols}, {AGGREGATES[aggfunc]}({value}) AS value
+            FROM {quote(table)}
+            GROUP BY {rows}, {cols}
+        """, connection)
+
+    return result.pivot(index = index, columns = columns, values = 'value')
@@ -0,0 +1,379 @@
+
+import io
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+
+
+BACKEND = os.environ.get("COWBOYSMALL_BACKEND", "columnar")
+
+
+
+def period_end(end):
+    # a partial date such as '2018-02' runs to the end of its period, as pandas' string slicing does
+    return pd.Period(end).end_time if isinstance(end, str) else pd.Timestamp(end)
+
+
+def row_range(index, start = None, end = None):
+    lower = 0 if start is None else np.searchsorted(index, pd.Timestamp(start).as_unit('ns').value, side = 'left')
+    upper = len(index) if end is None else np.searchsorted(index, period_end(end).as_unit('ns').value, side = 'right')
+
+    return int(lower), int(upper)
+
+
+
+def temporary(file):
+    # unique to the writer, so concurrent writers never share a half-written file
+    return f"{file}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def read_offsets(path):
+    offsets = None
+    if os.path.exists(f"{path}.offsets.npy"):
+        offsets = np.load(f"{path}.offsets.npy", mmap_mode = 'r')
+
+    # the csv file is only ever appended to, so an index that does not end where
+    # the file does is stale - mtimes are too coarse to tell within one tick
+    if offsets is None or offsets[1, -1] != os.path.getsize(f"{path}.csv"):
+        offsets = write_offsets(path)
+
+    return offsets[0, :-1], offsets[1]
+
+
+def write_offsets(path):
+    dates, offsets = [], []
+
+    with open(f"{path}.csv", "rb") as file:
+        position = len(file.readline())
+
+        for line in file:
+            dates.append(line[:line.index(b',')].decode())
+            offsets.append(position)
+            position += len(line)
+
+    offsets.append(position)
+    dates = pd.to_datetime(dates).as_unit('ns').asi8 if dates else np.empty(0, dtype = 'int64')
+
+    # row 0 holds the dates (padded to match), row 1 the byte offset of each row plus the end of file
+    offsets = np.array([np.append(dates, 0), offsets], dtype = 'int64')
+
+    # written aside and moved into place, so a reader never loads half a file
+    with open(temporary(f"{path}.offsets.npy"), "wb") as file:
+        np.save(file, offsets)
+    os.replace(temporary(f"{path}.offsets.npy"), f"{path}.offsets.npy")
+
+    return offsets
+
+
+def read_csv_rows(path, lower, upper, columns = None):
+    _, offsets = read_offsets(path)
+
+    # an empty range takes its dtypes from the first row, as any other read would
+    if lower >= upper and len(offsets) > 1:
+        return read_csv_rows(path, 0, 1, columns).iloc[:0]
+
+    with open(f"{path}.csv", "rb") as file:
+        header = file.readline()
+        file.seek(offsets[lower])
+        chunk  = file.read(offsets[upper] - offsets[lower])
+
+    return parse_csv(io.BytesIO(header + chunk), columns)
+
+
+def parse_csv(source, columns = None):
+    data = pd.read_csv(source, index_col = 'Date', usecols = None if columns is None else ['Date', *columns])
+
+    data.index = pd.to_datetime(data.index).as_unit('ns')
+
+    return data if columns is None else data[list(columns)]
+
+
+def read_csv(path, columns = None, start = None, end = None):
+    if start is None and end is None:
+        return parse_csv(f"{path}.csv", columns)
+
+    dates, _     = read_offsets(path)
+    lower, upper = row_range(dates, start, end)
+
+    return read_csv_rows(path, lower, upper, columns)
+
+
+def write_csv(data, path):
+    # a rewrite can end at the same size as the old file, so its index goes with it
+    if os.path.exists(f"{path}.offsets.npy"):
+        os.remove(f"{path}.offsets.npy")
+
+    data.to_csv(f"{path}.csv")
+
+    return data
+
+
+def append_csv(data, path):
+    with open(f"{path}.csv") as file:
+        header = file.readline().rstrip().split(',')
+
+    if header[1:] != list(data.columns):
+        raise ValueError(f"columns of appended data do not match {path}.csv")
+
+    data.to_csv(f"{path}.csv", mode = 'a', header = False)
+
+    return data
+
+
+
+def read_schema(path):
+    with open(os.path.join(f"{path}.columnar", "schema.json")) as file:
+        return json.load(file)
+
+
+def write_schema(schema, path):
+    file = os.path.join(f"{path}.columnar", "schema.json")
+
+    with open(temporary(file), "w") as handle:
+        json.dump(schema, handle, indent = 4)
+
+    os.replace(temporary(file), file)
+
+
+def index_file(path, schema):
+    # copies written before file names were versioned use the bare name
+    return os.path.join(f"{path}.columnar", schema.get('file', f"{schema['index']}.bin"))
+
+
+def column_file(path, column):
+    return os.path.join(f"{path}.columnar", column.get('file', f"{column['name']}.bin"))
+
+
+def read_array(file, dtype, lower, upper):
+    dtype = np.dtype(dtype)
+
+    return np.fromfile(file, dtype = dtype, count = upper - lower, offset = lower * dtype.itemsize)
+
+
+def read_columnar_rows(path, lower, upper, columns = None):
+    schema  = read_schema(path)
+    entries = {column['name']: column for column in schema['columns']}
+
+    index  = read_array(index_file(path, schema), 'datetime64[ns]', lower, upper)
+    values = {
+        column: read_array(column_file(path, entries[column]), entries[column]['dtype'], lower, upper)
+        for column in (columns or entries)
+    }
+
+    return pd.DataFrame(values, index = pd.DatetimeIndex(index, name = schema['index']))
+
+
+def read_columnar(path, columns = None, start = None, end = None):
+    schema = read_schema(path)
+
+    index = map_array(index_file(path, schema), 'int64', schema['length'])
+    lower, upper = row_range(index, start, end)
+
+    return read_columnar_rows(path, lower, upper, columns)
+
+
+def is_columnar(data):
+    return all(dtype.kind in 'biuf' for dtype in data.dtypes)
+
+
+def remove_files(path, schema):
+    # an existing map keeps its file after the unlink, so this is safe under readers
+    for file in {index_file(path, schema), *(column_file(path, column) for column in schema['columns'])}:
+        if os.path.exists(file):
+            os.remove(file)
+
+
+def remove_schema(path):
+    if os.path.exists(os.path.join(f"{path}.columnar", "schema.json")):
+        schema = read_schema(path)
+
+        os.remove(os.path.join(f"{path}.columnar", "schema.json"))
+        remove_files(path, schema)
+
+
+def write_columnar(data, path):
+    folder = f"{path}.columnar"
+
+    # checked before anything is written, so a failed write leaves the old copy intact
+    for column in data.columns:
+        if data[column].dtype.kind not in 'biuf':
+            raise TypeError(f"column {column} has non-numeric dtype {data[column].dtype}")
+
+    os.makedirs(folder, exist_ok = True)
+
+    # every write goes to new files and the schema is swapped in last, so a
+    # reader sees either the old copy or the new one, and the old files are
+    # only ever unlinked, never rewritten in place
+    previous = read_schema(path) if os.path.exists(os.path.join(folder, "schema.json")) else None
+    version  = uuid.uuid4().hex[:12]
+
+    index  = data.index.name or 'Date'
+    schema = {'index': index, 'file': f"{index}.{version}.bin", 'length': len(data), 'columns': []}
+    data.index.values.astype('datetime64[ns]').tofile(index_file(path, schema))
+
+    for column in data.columns:
+        values = np.ascontiguousarray(data[column].to_numpy())
+        schema['columns'].append({'name': column, 'dtype': values.dtype.str, 'file': f"{column}.{version}.bin"})
+        values.tofile(column_file(path, schema['columns'][-1]))
+
+    write_schema(schema, path)
+
+    if previous is not None:
+        remove_files(path, previous)
+
+    return data
+
+
+def append_array(file, values, length):
+    # anything past the recorded length is left over from an interrupted append
+    with open(file, "r+b") as handle:
+        handle.truncate(length * values.dtype.itemsize)
+        handle.seek(0, os.SEEK_END)
+        handle.write(values.tobytes())
+
+
+def append_columnar(data, path):
+    schema = read_schema(path)
+    folder = f"{path}.columnar"
+    length = schema['length']
+
+    if [column['name'] for column in schema['columns']] != list(data.columns):
+        raise ValueError(f"columns of appended data do not match {folder}")
+
+    append_array(index_file(path, schema), data.index.values.astype('datetime64[ns]'), length)
+
+    for column in schema['columns']:
+        values = np.ascontiguousarray(data[column['name']].to_numpy().astype(column['dtype']))
+        append_array(column_file(path, column), values, length)
+
+    schema['length'] = length + len(data)
+    write_schema(schema, path)
+
+    return data
+
+
+
+def map_array(file, dtype, length):
+    if length == 0:
+        return np.empty(0, dtype = dtype)
+
+    return np.memmap(file, dtype = dtype, mode = 'r', shape = (length,))
+
+
+def map_columnar(path):
+    schema = read_schema(path)
+    length = schema['length']
+
+    index   = map_array(index_file(path, schema), 'int64', length)
+    columns = {
+        column['name']: map_array(column_file(path, column), column['dtype'], length)
+        for column in schema['columns']
+    }
+
+    return schema['index'], index, columns
+
+
+def map_frame(path, columns = None, start = None, end = None):
+    if not is_fresh(path):
+        return read_csv(path, columns, start, end)
+
+    name, index, values = map_columnar(path)
+    lower, upper = row_range(index, start, end)
+
+    # slices of the memory maps are views, and copy = False keeps them that way
+    return pd.DataFrame(
+        {column: values[column][lower:upper] for column in (columns or values)},
+        index = pd.DatetimeIndex(index[lower:upper].view('datetime64[ns]'), name = name),
+        copy  = False
+    )
+
+
+
+def is_fresh(path):
+    schema = os.path.join(f"{path}.columnar", "schema.json")
+
+    if not os.path.exists(schema):
+        return False
+
+    if not os.path.exists(f"{path}.csv"):
+        return True
+
+    return os.path.getmtime(f"{path}.csv") <= os.path.getmtime(schema)
+
+
+def read_frame(path, backend = None, columns = None, start = None, end = None):
+    backend = backend or BACKEND
+
+    if backend == 'csv':
+        return read_csv(path, columns, start, end)
+
+    # without a fresh columnar copy the csv file is read - build_frame makes one
+    if not is_fresh(path):
+        return read_csv(path, columns, start, end)
+
+    return read_columnar(path, columns, start, end)
+
+
+def read_tail(path, rows = 1, backend = None):
+    backend = backend or BACKEND
+
+    if backend == 'csv' or not is_fresh(path):
+        dates, _ = read_offsets(path)
+        return read_csv_rows(path, max(len(dates) - rows, 0), len(dates))
+
+    length = read_schema(path)['length']
+
+    return read_columnar_rows(path, max(length - rows, 0), length)
+
+
+def build_frame(path):
+    # the columnar copy of the csv file, rebuilt only when it is missing or stale
+    if not is_fresh(path):
+        data = read_csv(path)
+
+        if is_columnar(data):
+            write_columnar(data, path)
+
+    return is_fresh(path)
+
+
+def write_frame(data, path, backend = None):
+    backend = backend or BACKEND
+
+    # a frame with non-numeric columns is kept as csv only, and any older
+    # columnar copy is dropped so it can never be read in its place
+    if backend == 'csv' or not is_columnar(data):
+        remove_schema(path)
+        return write_csv(data, path)
+
+    write_csv(data, path)
+    write_columnar(data, path)
+
+    return data
+
+
+def append_frame(data, path, backend = None):
+    backend = backend or BACKEND
+
+    if data.empty:
+        return data
+
+    last = read_tail(path, backend = backend)
+    if not last.empty and data.index[0] <= last.index[-1]:
+        raise ValueError(f"appended data must start after {last.index[-1].date()}")
+
+    columnar = backend != 'csv' and is_columnar(data) and build_frame(path)
+    if not columnar:
+        remove_schema(path)
+
+    append_csv(data, path)
+
+    if columnar:
+        append_columnar(data, path)
+
+    return data
@@ -0,0 +1,350 @@
+
+import numpy as np
+
+from scipy.signal import lfilter
+
+
+
+# every function here takes and returns 2-D (time x instrument) float arrays,
+# one column per instrument - the defaults and edge cases follow the ta library;
+# the sweeps add a third axis, one slice per window length
+
+def as_matrix(values):
+    values = np.asarray(values, dtype = 'float64')
+
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def shift(values, periods = 1):
+    values  = as_matrix(values)
+    shifted = np.full_like(values, np.nan)
+
+    if 0 <= periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    elif -len(values) < periods < 0:
+        shifted[:periods] = values[-periods:]
+
+    return shifted
+
+
+def diff(values, periods = 1):
+    values = as_matrix(values)
+
+    return values - shift(values, periods)
+
+
+def first_valid(valid):
+    return np.where(valid.any(axis = 0), valid.argmax(axis = 0), len(valid))
+
+
+def windowed(values, windows):
+    # one pair of prefix sums serves every window length
+    valid  = ~np.isnan(values)
+    sums   = np.cumsum(np.where(valid, values, 0.0), axis = 0)
+    counts = np.cumsum(valid, axis = 0)
+
+    for window in windows:
+        total, count = sums.copy(), counts.copy()
+
+        if window < len(values):
+            total[window:] -= sums[:len(values) - window]
+            count[window:] -= counts[:len(values) - window]
+
+        yield total, count
+
+
+def rolling_sums(values, windows, min_periods = None):
+    values      = as_matrix(values)
+    windows     = np.atleast_1d(windows)
+    min_periods = windows if min_periods is None else np.broadcast_to(min_periods, windows.shape)
+
+    # filled window by window, so windows lead in memory
+    result = np.empty((len(windows),) + values.shape)
+    for i, (total, count) in enumerate(windowed(values, windows)):
+        result[i] = np.where(count >= max(min_periods[i], 1), total, np.nan)
+
+    return np.moveaxis(result, 0, -1)
+
+
+def rolling_means(values, windows, min_periods = None):
+    values      = as_matrix(values)
+    windows     = np.atleast_1d(windows)
+    min_periods = windows if min_periods is None else np.broadcast_to(min_periods, windows.shape)
+
+    result = np.empty((len(windows),) + values.shape)
+    for i, (total, count) in enumerate(windowed(values, windows)):
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            result[i] = np.where(count >= max(min_periods[i], 1), total / count, np.nan)
+
+    return np.moveaxis(result, 0, -1)
+
+
+def rolling_sum(values, window, min_periods = None):
+    return rolling_sums(values, [window], min_periods)[:, :, 0]
+
+
+def rolling_mean(values, window, min_periods = None):
+    return rolling_means(values, [window], min_periods)[:, :, 0]
+
+
+def rolling_count(values, window):
+    counts = np.cumsum(~np.isnan(values), axis = 0)
+
+    if window < len(values):
+        counts[window:] -= counts[:len(values) - window].copy()
+
+    return counts
+
+
+def rolling_extreme(values, window, min_periods, extreme):
+    values      = as_matrix(values)
+    min_periods = window if min_periods is None else min_periods
+    length      = len(values)
+
+    # van Herk / Gil-Werman - every window is one block suffix plus the next
+    # block prefix, so two accumulations replace the window scan
+    blocks = -(-(length + window - 1) // window)
+    padded = np.full((blocks * window, values.shape[1]), np.nan)
+    padded[window - 1:window - 1 + length] = values
+    padded = padded.reshape(blocks, window, -1)
+
+    prefix = extreme.accumulate(padded, axis = 1).reshape(-1, values.shape[1])
+    suffix = extreme.accumulate(padded[:, ::-1], axis = 1)[:, ::-1].reshape(-1, values.shape[1])
+
+    result = extreme(suffix[:length], prefix[window - 1:window - 1 + length])
+
+    return np.where(rolling_count(values, window) >= max(min_periods, 1), result, np.nan)
+
+
+def rolling_max(values, window, min_periods = None):
+    return rolling_extreme(values, window, min_periods, np.fmax)
+
+
+def rolling_min(values, window, min_periods = None):
+    return rolling_extreme(values, window, min_periods, np.fmin)
+
+
+def ewm_means(values, alphas, min_periods = 0):
+    values      = as_matrix(values)
+    alphas      = np.atleast_1d(alphas)
+    min_periods = np.maximum(np.broadcast_to(min_periods, alphas.shape), 1)
+
+    result = np.empty((len(alphas),) + values.shape)
+    if len(values) == 0:
+        return np.moveaxis(result, 0, -1)
+
+    valid = ~np.isnan(values)
+    first = first_valid(valid)
+    rows  = np.arange(len(values))[:, None]
+    gaps  = np.flatnonzero((~valid & (rows >= first)).any(axis = 0))
+
+    # with only leading gaps the recursion is a plain first order filter
+    start  = values[np.minimum(first, len(values) - 1), np.arange(values.shape[1])]
+    start  = np.where(np.isnan(start), 0.0, start)
+    filled = np.where(rows < first, start, values)
+
+    for i, (alpha, minimum) in enumerate(zip(alphas, min_periods)):
+        smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], filled, axis = 0, zi = ((1.0 - alpha) * start)[None, :])
+        result[i]   = np.where(rows >= first + minimum - 1, smoothed, np.nan)
+
+        # instruments with gaps after their first bar are filtered segment by segment
+        for j in gaps:
+            result[i, :, j] = ewm_mean_gaps(values[:, j], alpha, minimum)
+
+    return np.moveaxis(result, 0, -1)
+
+
+def ewm_mean(values, alpha, min_periods = 0):
+    return ewm_means(values, [alpha], [min_periods])[:, :, 0]
+
+
+def ewm_mean_gaps(values, alpha, min_periods):
+    # pandas ewm(adjust = False, ignore_na = False) - a gap decays the weight
+    # of the running mean until the next bar, then the plain recursion resumes
+    valid    = ~np.isnan(values)
+    rows     = np.flatnonzero(valid)
+    smoothed = np.full_like(values, np.nan)
+
+    segments = np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1)
+    weighted = values[rows[0]]
+    for previous, segment in zip([None] + segments[:-1], segments):
+        current = values[segment[0]]
+
+        if previous is not None and weighted != current:
+            weight   = (1.0 - alpha) ** (segment[0] - previous[-1])
+            weighted = (weight * weighted + alpha * current) / (weight + alpha)
+
+        smoothed[segment[0]] = weighted
+
+        if len(segment) > 1:
+            tail, _  = lfilter([alpha], [1.0, alpha - 1.0], values[segment[1:]], zi = [(1.0 - alpha) * weighted])
+            weighted = tail[-1]
+
+            smoothed[segment[1:]] = tail
+
+    # the running mean carries through each gap
+    carried  = np.maximum.accumulate(np.where(valid, np.arange(len(values)), 0))
+    smoothed = np.where(rows[0] <= np.arange(len(values)), smoothed[carried], np.nan)
+
+    return np.where(np.cumsum(valid) >= min_periods, smoothed, np.nan)
+
+
+
+def rsi(close, window = 14):
+    delta = diff(close)
+
+    up   = np.where(delta > 0, delta, 0.0)
+    down = -np.where(delta < 0, delta, 0.0)
+
+    mean_up   = ewm_mean(up, 1 / window, window)
+    mean_down = ewm_mean(down, 1 / window, window)
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return np.where(mean_down == 0, 100.0, 100 - (100 / (1 + mean_up / mean_down)))
+
+
+def roc(close, window = 12):
+    previous = shift(close, window)
+
+    return ((as_matrix(close) - previous) / previous) * 100
+
+
+def awesome_oscillator(high, low, window1 = 5, window2 = 34):
+    median = 0.5 * (as_matrix(high) + as_matrix(low))
+
+    return rolling_mean(median, window1) - rolling_mean(median, window2)
+
+
+def kama(close, window = 10, pow1 = 2, pow2 = 30):
+    close = as_matrix(close)
+
+    # np.roll wraps around, exactly as ta does
+    volatility = np.abs(close - np.roll(close, 1, axis = 0))
+    change     = np.abs(close - np.roll(close, window, axis = 0))
+    total      = rolling_sum(volatility, window, window)
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        ratio = np.where(total != 0, change / total, 0.0)
+
+    constant = (ratio * (2.0 / (pow1 + 1) - 2.0 / (pow2 + 1.0)) + 2 / (pow2 + 1.0)) ** 2.0
+
+    result  = np.full_like(close, np.nan)
+    started = np.zeros(close.shape[1], dtype = bool)
+    for i in range(len(close)):
+        missing = np.isnan(constant[i])
+        if i:
+            result[i] = result[i - 1] + constant[i] * (close[i] - result[i - 1])
+
+        result[i] = np.where(missing, np.nan, np.where(started, result[i], close[i]))
+        started   = started | ~missing
+
+    return result
+
+
+def tsi(close, window_slow = 25, window_fast = 13):
+    delta = diff(close)
+
+    smoothed     = ewm_mean(ewm_mean(delta, 2 / (window_slow + 1), window_slow), 2 / (window_fast + 1), window_fast)
+    smoothed_abs = ewm_mean(ewm_mean(np.abs(delta), 2 / (window_slow + 1), window_slow), 2 / (window_fast + 1), window_fast)
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return (smoothed / smoothed_abs) * 100
+
+
+def volume_price_trend(close, volume):
+    close = as_matrix(close)
+    trend = (close / shift(close) - 1) * as_matrix(volume)
+
+    return np.where(np.isnan(trend), np.nan, np.nancumsum(trend, axis = 0))
+
+
+def drawdown(close, window = None):
+    close = as_matrix(close)
+
+    # from the running peak, or the peak of the trailing window
+    peak = np.fmax.accumulate(close, axis = 0) if window is None else rolling_max(close, window, 1)
+
+    return 100 * (close - peak) / peak
+
+
+def ulcer_index(close, window = 14):
+    return np.sqrt(rolling_sum(drawdown(close, window) ** 2, window) / window)
+
+
+# the bands keep ta's (high, low, close, window, offset) signature, so they
+# are drop in replacements even where a band does not use every series
+def donchian_channel_hband(high, low, close, window = 20, offset = 0):
+    return shift(rolling_max(high, window), offset)
+
+
+def donchian_channel_lband(high, low, close, window = 20, offset = 0):
+    return shift(rolling_min(low, window), offset)
+
+
+def donchian_channel_mband(high, low, close, window = 20, offset = 0):
+    hband = rolling_max(high, window)
+    lband = rolling_min(low, window)
+
+    return shift(((hband - lband) / 2.0) + lband, offset)
+
+
+def donchian_channel_wband(high, low, close, window = 20, offset = 0):
+    hband = rolling_max(high, window)
+    lband = rolling_min(low, window)
+
+    return shift(((hband - lband) / rolling_mean(close, window)) * 100, offset)
+
+
+def donchian_channel_pband(high, low, close, window = 20, offset = 0):
+    hband = rolling_max(high, window)
+    lband = rolling_min(low, window)
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return shift((as_matrix(close) - lband) / (hband - lband), offset)
+
+
+def sma_indicator(close, window = 12):
+    return rolling_mean(close, window)
+
+
+def ema_indicator(close, window = 12):
+    return ewm_mean(close, 2 / (window + 1), window)
+
+
+
+def sma_sweep(close, windows):
+    return rolling_means(close, windows)
+
+
+def ema_sweep(close, windows):
+    windows = np.atleast_1d(windows)
+
+    return ewm_means(close, 2 / (windows + 1), windows)
+
+
+def roc_sweep(close, windows):
+    close  = as_matrix(close)
+    result = np.empty((len(windows),) + close.shape)
+
+    for i, window in enumerate(windows):
+        previous = shift(close, window)
+
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            result[i] = ((close - previous) / previous) * 100
+
+    return np.moveaxis(result, 0, -1)
+
+
+def rsi_sweep(close, windows):
+    windows = np.atleast_1d(windows)
+    delta   = diff(close)
+
+    # the same up and down moves feed every window
+    up   = np.where(delta > 0, delta, 0.0)
+    down = -np.where(delta < 0, delta, 0.0)
+
+    mean_up   = ewm_means(up, 1 / windows, windows)
+    mean_down = ewm_means(down, 1 / windows, windows)
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return np.where(mean_down == 0, 100.0, 100 - (100 / (1 + mean_up / mean_down)))
@@ -0,0 +1,222 @@
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from cowboysmall.feature import engine
+
+
+
+# a feature is a node over (time x instrument) arrays - nodes are plain
+# hashable tuples, so the same intermediate declared by two features is
+# the same cache entry and is only ever evaluated once
+
+Node = namedtuple('Node', ['operation', 'inputs', 'parameters'])
+
+
+
+def node(operation, *inputs, **parameters):
+    return Node(operation, inputs, tuple(sorted(parameters.items())))
+
+
+def field(name):
+    return node('field', name = name)
+
+
+def percent(numerator, denominator):
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return (numerator / denominator) * 100
+
+
+def relative_strength(mean_up, mean_down):
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return np.where(mean_down == 0, 100.0, 100 - (100 / (1 + mean_up / mean_down)))
+
+
+def ratio(numerator, denominator):
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return numerator / denominator
+
+
+
+OPERATIONS = {
+    'diff':               engine.diff,
+    'shift':              engine.shift,
+    'absolute':           np.abs,
+    'positive':           lambda values: np.where(values > 0, values, 0.0),
+    'negative':           lambda values: -np.where(values < 0, values, 0.0),
+    'subtract':           np.subtract,
+    'median':             lambda high, low: 0.5 * (high + low),
+    'ratio':              ratio,
+    'percent':            percent,
+    'ewm':                engine.ewm_mean,
+    'rolling_mean':       engine.rolling_mean,
+    'relative_strength':  relative_strength,
+    'kama':               engine.kama,
+    'volume_price_trend': engine.volume_price_trend,
+    'ulcer_index':        engine.ulcer_index
+}
+
+
+
+OPEN   = field('OPEN')
+HIGH   = field('HIGH')
+LOW    = field('LOW')
+CLOSE  = field('CLOSE')
+VOLUME = field('VOLUME')
+
+DELTA  = node('diff', CLOSE)
+MEDIAN = node('median', HIGH, LOW)
+
+
+
+def ema(values, window):
+    return node('ewm', values, alpha = 2 / (window + 1), min_periods = window)
+
+
+def wilder(values, window):
+    return node('ewm', values, alpha = 1 / window, min_periods = window)
+
+
+def rsi(window = 14):
+    return node('relative_strength', wilder(node('positive', DELTA), window), wilder(node('negative', DELTA), window))
+
+
+def tsi(window_slow = 25, window_fast = 13):
+    smoothed     = ema(ema(DELTA, window_slow), window_fast)
+    smoothed_abs = ema(ema(node('absolute', DELTA), window_slow), window_fast)
+
+    return node('percent', smoothed, smoothed_abs)
+
+
+def roc(window = 12):
+    previous = node('shift', CLOSE, periods = window)
+
+    return node('percent', node('subtract', CLOSE, previous), previous)
+
+
+def awesome_oscillator(window1 = 5, window2 = 34):
+    return node('subtract', node('rolling_mean', MEDIAN, window = window1), node('rolling_mean', MEDIAN, window = window2))
+
+
+def kama(window = 10, pow1 = 2, pow2 = 30):
+    return node('kama', CLOSE, window = window, pow1 = pow1, pow2 = pow2)
+
+
+def ulcer_index(window = 14):
+    return node('ulcer_index', CLOSE, window = window)
+
+
+def sma(window = 12):
+    return node('rolling_mean', CLOSE, window = window)
+
+
+
+PRICES = ['OPEN', 'HIGH', 'LOW', 'CLOSE']
+
+
+
+# feature suffix -> node, so NSEI_RSI is FEATURES['RSI'] evaluated for NSEI
+FEATURES = {
+    'HL_RATIO': node('ratio', HIGH, LOW),
+    'ROC':      roc(),
+    'RSI':      rsi(),
+    'AWE':      awesome_oscillator(),
+    'KAM':      kama(),
+    'TSI':      tsi(),
+    'VPT':      node('volume_price_trend', CLOSE, VOLUME),
+    'ULC':      ulcer_index(),
+    'SMA':      sma(),
+    'EMA':      ema(CLOSE, 12)
+}
+
+
+
+class Graph:
+
+    def __init__(self, data, instruments):
+        self.data        = data
+        self.instruments = list(instruments)
+
+        self.cache  = {}
+        self.hits   = 0
+        self.misses = 0
+
+    def evaluate(self, node):
+        if node in self.cache:
+            self.hits += 1
+            return self.cache[node]
+
+        self.misses += 1
+
+        if node.operation == 'field':
+            result = self.field(dict(node.parameters)['name'])
+        else:
+            result = OPERATIONS[node.operation](*[self.evaluate(source) for source in node.inputs], **dict(node.parameters))
+
+        self.cache[node] = result
+
+        return result
+
+    def field(self, name):
+        return self.data[[f"{instrument}_{name}" for instrument in self.instruments]].to_numpy(dtype = 'float64')
+
+
+
+def fields(node):
+    if node.operation == 'field':
+        return [dict(node.parameters)['name']]
+
+    return list(dict.fromkeys(name for source in node.inputs for name in fields(source)))
+
+
+def split_column(column, features = FEATURES):
+    for suffix in sorted(features, key = len, reverse = True):
+        if column.endswith(f"_{suffix}"):
+            return column[:-len(suffix) - 1], suffix
+
+    raise ValueError(f"no feature is declared for column {column}")
+
+
+def compute(data, columns, features = FEATURES, graph = None):
+    requested   = [split_column(column, features) for column in columns]
+    instruments = list(dict.fromkeys(instrument for instrument, _ in requested))
+
+    # only the nodes behind the requested columns are evaluated
+    graph = graph or Graph(data, instruments)
+
+    return pd.DataFrame({
+        column: graph.evaluate(features[suffix])[:, graph.instruments.index(instrument)]
+        for column, (instrument, suffix) in zip(columns, requested)
+    }, index = data.index)
+
+
+
+def discover_instruments(data):
+    # an instrument is any prefix with a full set of price columns
+    prefixes = [column[:-len(field) - 1] for column in data.columns for field in PRICES if column.endswith(f"_{field}")]
+
+    return [prefix for prefix in dict.fromkeys(prefixes) if all(f"{prefix}_{field}" in data.columns for field in PRICES)]
+
+
+def feature_columns(instruments, names):
+    return [f"{instrument}_{name}" for name in names for instrument in instruments]
+
+
+def build_features(data, instruments = None, names = tuple(FEATURES), features = FEATURES):
+    instruments = discover_instruments(data) if instruments is None else list(instruments)
+    nodes       = [features[name] for name in names]
+
+    needed  = dict.fromkeys(field for node in nodes for field in fields(node))
+    missing = [f"{instrument}_{field}" for field in needed for instrument in instruments if f"{instrument}_{field}" not in data.columns]
+    if missing:
+        raise ValueError(f"missing columns for the requested features: {', '.join(missing)}")
+
+    # one block for every feature of every instrument, filled feature by feature
+    graph  = Graph(data, instruments)
+    result = np.empty((len(data), len(nodes) * len(instruments)))
+    for i, node in enumerate(nodes):
+        result[:, i * len(instruments):(i + 1) * len(instruments)] = graph.evaluate(node)
+
+    return pd.DataFrame(result, index = data.index, columns = feature_columns(instruments, names))
@@ -1,61 +1,26 @@
+from cowboysmall.feature.graph import build_features
 
-import ta
 
 
-
-def get_ratios(data):
-    data["NSEI_HL_RATIO"] = data["NSEI_HIGH"] / data["NSEI_LOW"]
-    data["DJI_HL_RATIO"]  = data["DJI_HIGH"] / data["DJI_LOW"]
-
-    return data
-
-
-def get_indicators(data):
-    data["NSEI_RSI"] = ta.momentum.rsi(data["NSEI_CLOSE"])
-    data["DJI_RSI"]  = ta.momentum.rsi(data["DJI_CLOSE"])
-
-    data["NSEI_TSI"] = ta.momentum.tsi(data["NSEI_CLOSE"])
-    data["DJI_TSI"]  = ta.momentum.tsi(data["DJI_CLOSE"])
+def assign(data, features):
+    data[list(features.columns)] = features.to_numpy()
 
     return data
 
 
-def get_all_indicators(data):
-    data["NSEI_ROC"] = ta.momentum.roc(data["NSEI_CLOSE"])
-    data["DJI_ROC"]  = ta.momentum.roc(data["DJI_CLOSE"])
-
-    data["NSEI_RSI"] = ta.momentum.rsi(data["NSEI_CLOSE"])
-    data["DJI_RSI"]  = ta.momentum.rsi(data["DJI_CLOSE"])
-
-    data["NSEI_AWE"] = ta.momentum.awesome_oscillator(data["NSEI_HIGH"], data["NSEI_LOW"])
-    data["DJI_AWE"]  = ta.momentum.awesome_oscillator(data["DJI_HIGH"], data["NSEI_LOW"])
+def get_ratios(data, instruments = ("NSEI", "DJI")):
+    return assign(data, build_features(data, instruments, ["HL_RATIO"]))
 
-    data["NSEI_KAM"] = ta.momentum.kama(data["NSEI_CLOSE"])
-    data["DJI_KAM"]  = ta.momentum.kama(data["DJI_CLOSE"])
 
-    data["NSEI_TSI"] = ta.momentum.tsi(data["NSEI_CLOSE"])
-    data["DJI_TSI"]  = ta.momentum.tsi(data["DJI_CLOSE"])
+def get_indicators(data, instruments = ("NSEI", "DJI")):
+    return assign(data, build_features(data, instruments, ["RSI", "TSI"]))
 
 
-    data["NSEI_VPT"] = ta.volume.volume_price_trend(data["NSEI_CLOSE"], data["NSEI_VOLUME"])
-    data["DJI_VPT"]  = ta.volume.volume_price_trend(data["DJI_CLOSE"], data["DJI_VOLUME"])
-
-
-    data["NSEI_ULC"] = ta.volatility.ulcer_index(data["NSEI_CLOSE"])
-    data["DJI_ULC"]  = ta.volatility.ulcer_index(data["DJI_CLOSE"])
-
-
-    data["NSEI_SMA"] = ta.trend.sma_indicator(data["NSEI_CLOSE"])
-    data["DJI_SMA"]  = ta.trend.sma_indicator(data["DJI_CLOSE"])
-
-    data["NSEI_EMA"] = ta.trend.ema_indicator(data["NSEI_CLOSE"])
-    data["DJI_EMA"]  = ta.trend.ema_indicator(data["DJI_CLOSE"])
-
-    return data
-
+def get_all_indicators(data, instruments = ("NSEI", "DJI")):
+    return assign(data, build_features(data, instruments, ["ROC", "RSI", "AWE", "KAM", "TSI", "VPT", "ULC", "SMA", "EMA"]))
 
 
-# this is no longer used as I am using the ta library for indicator 
+# this is no longer used as I am using the indicator engine for indicator 
 # creation - I leave it here for the sake of interest
 
 def calculate_rsi(values, window = 14):
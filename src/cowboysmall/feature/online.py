@@ -0,0 +1,420 @@
+
+import math
+
+from collections import deque
+
+
+
+# online counterparts of the indicator engine - each object holds just the
+# state its indicator needs and takes one bar per update, so a live feed pays
+# a constant cost per tick instead of recomputing the full history
+
+NAN = float('nan')
+
+
+
+def divide(numerator, denominator):
+    if denominator:
+        return numerator / denominator
+
+    # follow numpy - x / 0 is a signed infinity and 0 / 0 is nan
+    if not numerator or numerator != numerator:
+        return NAN
+
+    return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+
+
+def slots(cls):
+    return [name for klass in reversed(cls.__mro__) for name in getattr(klass, '__slots__', ())]
+
+
+def dump(value):
+    if isinstance(value, State):
+        return value.state()
+
+    if isinstance(value, deque):
+        return {'deque': [list(item) for item in value]}
+
+    if isinstance(value, list):
+        return [dump(item) for item in value]
+
+    return value
+
+
+def load(value):
+    if isinstance(value, dict) and 'type' in value:
+        return State.restore(value)
+
+    if isinstance(value, dict) and 'deque' in value:
+        return deque(tuple(item) for item in value['deque'])
+
+    if isinstance(value, list):
+        return [load(item) for item in value]
+
+    return value
+
+
+
+class State:
+    __slots__ = ()
+
+    def state(self):
+        return {'type': type(self).__name__, **{name: dump(getattr(self, name)) for name in slots(type(self))}}
+
+    @staticmethod
+    def restore(state):
+        cls      = STATES[state['type']]
+        restored = cls.__new__(cls)
+
+        for name in slots(cls):
+            setattr(restored, name, load(state[name]))
+
+        return restored
+
+
+
+class EMA(State):
+    __slots__ = ('alpha', 'min_periods', 'mean', 'weight', 'count')
+
+    def __init__(self, alpha, min_periods = 0):
+        self.alpha       = alpha
+        self.min_periods = max(min_periods, 1)
+
+        self.mean   = NAN
+        self.weight = 1.0
+        self.count  = 0
+
+    def update(self, value):
+        valid = value == value
+
+        # pandas ewm(adjust = False) - a gap decays the weight of the running mean
+        if self.mean != self.mean:
+            if valid:
+                self.mean = value
+        else:
+            self.weight *= 1.0 - self.alpha
+
+            if valid:
+                if self.mean != value:
+                    self.mean = (self.weight * self.mean + self.alpha * value) / (self.weight + self.alpha)
+                self.weight = 1.0
+
+        self.count += valid
+
+        return self.mean if self.count >= self.min_periods else NAN
+
+
+class Wilder(EMA):
+    __slots__ = ()
+
+    def __init__(self, window):
+        super().__init__(1 / window, window)
+
+
+class Lag(State):
+    __slots__ = ('values', 'position')
+
+    def __init__(self, periods):
+        self.values   = [NAN] * periods
+        self.position = 0
+
+    def update(self, value):
+        previous = self.values[self.position]
+
+        self.values[self.position] = value
+        self.position              = (self.position + 1) % len(self.values)
+
+        return previous
+
+
+class Window(State):
+    __slots__ = ('min_periods', 'lag', 'total', 'count', 'nonzero')
+
+    def __init__(self, size, min_periods = None):
+        self.min_periods = max(size if min_periods is None else min_periods, 1)
+        self.lag         = Lag(size)
+
+        self.total   = 0.0
+        self.count   = 0
+        self.nonzero = 0
+
+    def update(self, value):
+        leaving = self.lag.update(value)
+
+        if leaving == leaving:
+            self.total   -= leaving
+            self.count   -= 1
+            self.nonzero -= leaving != 0
+
+        if value == value:
+            self.total   += value
+            self.count   += 1
+            self.nonzero += value != 0
+
+        # resum once a lap so the running total cannot drift
+        if self.lag.position == 0:
+            self.total = math.fsum(item for item in self.lag.values if item == item)
+
+        if not self.nonzero:
+            self.total = 0.0
+
+        return self
+
+    def sum(self):
+        return self.total if self.count >= self.min_periods else NAN
+
+    def mean(self):
+        return self.total / self.count if self.count >= self.min_periods else NAN
+
+
+class RollingMax(State):
+    __slots__ = ('size', 'min_periods', 'lag', 'index', 'count', 'candidates')
+
+    def __init__(self, size, min_periods = None):
+        self.size        = size
+        self.min_periods = max(size if min_periods is None else min_periods, 1)
+        self.lag         = Lag(size)
+
+        self.index      = 0
+        self.count      = 0
+        self.candidates = deque()
+
+    def update(self, value):
+        leaving     = self.lag.update(value)
+        self.count += (value == value) - (leaving == leaving)
+
+        # a monotonic deque - each value is pushed and popped at most once
+        while self.candidates and self.candidates[0][0] <= self.index - self.size:
+            self.candidates.popleft()
+
+        if value == value:
+            while self.candidates and self.candidates[-1][1] <= value:
+                self.candidates.pop()
+            self.candidates.append((self.index, value))
+
+        self.index += 1
+
+        return self.candidates[0][1] if self.candidates and self.count >= self.min_periods else NAN
+
+
+
+class HLRatio(State):
+    __slots__ = ()
+
+    def update(self, high, low):
+        return divide(high, low)
+
+
+class RSI(State):
+    __slots__ = ('previous', 'up', 'down')
+
+    def __init__(self, window = 14):
+        self.previous = NAN
+        self.up       = Wilder(window)
+        self.down     = Wilder(window)
+
+    def update(self, close):
+        delta         = close - self.previous
+        self.previous = close
+
+        mean_up   = self.up.update(delta if delta > 0 else 0.0)
+        mean_down = self.down.update(-delta if delta < 0 else 0.0)
+
+        return 100.0 if mean_down == 0 else 100 - (100 / (1 + mean_up / mean_down))
+
+
+class ROC(State):
+    __slots__ = ('lag',)
+
+    def __init__(self, window = 12):
+        self.lag = Lag(window)
+
+    def update(self, close):
+        previous = self.lag.update(close)
+
+        return divide(close - previous, previous) * 100
+
+
+class AwesomeOscillator(State):
+    __slots__ = ('fast', 'slow')
+
+    def __init__(self, window1 = 5, window2 = 34):
+        self.fast = Window(window1)
+        self.slow = Window(window2)
+
+    def update(self, high, low):
+        median = 0.5 * (high + low)
+
+        return self.fast.update(median).mean() - self.slow.update(median).mean()
+
+
+class KAMA(State):
+    __slots__ = ('fast', 'slow', 'bars', 'previous', 'lag', 'volatility', 'kama', 'started')
+
+    def __init__(self, window = 10, pow1 = 2, pow2 = 30):
+        self.fast = 2.0 / (pow1 + 1)
+        self.slow = 2.0 / (pow2 + 1.0)
+
+        self.bars       = 0
+        self.previous   = NAN
+        self.lag        = Lag(window)
+        self.volatility = Window(window)
+        self.kama       = NAN
+        self.started    = False
+
+    def update(self, close):
+        # ta wraps its look-backs around the series - before the first full
+        # window there is nothing to look back on, so the first ratio is 0
+        warming = self.bars < len(self.lag.values) and close == close
+
+        change     = abs(close - self.lag.update(close))
+        volatility = abs(close - self.previous)
+        if warming:
+            change     = 0.0 if change != change else change
+            volatility = 0.0 if volatility != volatility else volatility
+
+        self.bars     += 1
+        self.previous  = close
+
+        total    = self.volatility.update(volatility).sum()
+        ratio    = divide(change, total) if total != 0 else 0.0
+        constant = (ratio * (self.fast - self.slow) + self.slow) ** 2.0
+
+        if constant != constant:
+            self.kama = NAN
+        elif not self.started:
+            self.kama    = close
+            self.started = True
+        else:
+            self.kama = self.kama + constant * (close - self.kama)
+
+        return self.kama
+
+
+class TSI(State):
+    __slots__ = ('previous', 'slow', 'fast', 'slow_abs', 'fast_abs')
+
+    def __init__(self, window_slow = 25, window_fast = 13):
+        self.previous = NAN
+
+        self.slow     = EMA(2 / (window_slow + 1), window_slow)
+        self.fast     = EMA(2 / (window_fast + 1), window_fast)
+        self.slow_abs = EMA(2 / (window_slow + 1), window_slow)
+        self.fast_abs = EMA(2 / (window_fast + 1), window_fast)
+
+    def update(self, close):
+        delta         = close - self.previous
+        self.previous = close
+
+        smoothed     = self.fast.update(self.slow.update(delta))
+        smoothed_abs = self.fast_abs.update(self.slow_abs.update(abs(delta)))
+
+        return divide(smoothed, smoothed_abs) * 100
+
+
+class VPT(State):
+    __slots__ = ('previous', 'total')
+
+    def __init__(self):
+        self.previous = NAN
+        self.total    = 0.0
+
+    def update(self, close, volume):
+        trend         = (divide(close, self.previous) - 1) * volume
+        self.previous = close
+
+        if trend != trend:
+            return NAN
+
+        self.total += trend
+
+        return self.total
+
+
+class UlcerIndex(State):
+    __slots__ = ('window', 'maximum', 'squares')
+
+    def __init__(self, window = 14):
+        self.window  = window
+        self.maximum = RollingMax(window, 1)
+        self.squares = Window(window)
+
+    def update(self, close):
+        maximum = self.maximum.update(close)
+        percent = divide(100 * (close - maximum), maximum)
+
+        # max keeps nan but clips rounding below zero
+        return math.sqrt(max(self.squares.update(percent ** 2).sum(), 0.0) / self.window)
+
+
+class SMA(State):
+    __slots__ = ('window',)
+
+    def __init__(self, window = 12):
+        self.window = Window(window)
+
+    def update(self, close):
+        return self.window.update(close).mean()
+
+
+class EMAIndicator(State):
+    __slots__ = ('ema',)
+
+    def __init__(self, window = 12):
+        self.ema = EMA(2 / (window + 1), window)
+
+    def update(self, close):
+        return self.ema.update(close)
+
+
+
+# feature suffix -> indicator and the bar fields it reads, as in the feature graph
+INDICATORS = {
+    'HL_RATIO': (HLRatio,           ['HIGH', 'LOW']),
+    'ROC':      (ROC,               ['CLOSE']),
+    'RSI':      (RSI,               ['CLOSE']),
+    'AWE':      (AwesomeOscillator, ['HIGH', 'LOW']),
+    'KAM':      (KAMA,              ['CLOSE']),
+    'TSI':      (TSI,               ['CLOSE']),
+    'VPT':      (VPT,               ['CLOSE', 'VOLUME']),
+    'ULC':      (UlcerIndex,        ['CLOSE']),
+    'SMA':      (SMA,               ['CLOSE']),
+    'EMA':      (EMAIndicator,      ['CLOSE'])
+}
+
+
+
+class Features(State):
+    __slots__ = ('instruments', 'names', 'indicators')
+
+    def __init__(self, instruments, names = tuple(INDICATORS)):
+        self.instruments = list(instruments)
+        self.names       = list(names)
+        self.indicators  = [INDICATORS[name][0]() for _ in self.instruments for name in self.names]
+
+    def update(self, bar):
+        features   = {}
+        indicators = iter(self.indicators)
+
+        for instrument in self.instruments:
+            for name in self.names:
+                fields = [bar[f"{instrument}_{field}"] for field in INDICATORS[name][1]]
+                features[f"{instrument}_{name}"] = next(indicators).update(*map(float, fields))
+
+        return features
+
+    def warm(self, data):
+        features = {}
+
+        for bar in data.to_dict('records'):
+            features = self.update(bar)
+
+        return features
+
+
+
+STATES = {cls.__name__: cls for cls in [
+    EMA, Wilder, Lag, Window, RollingMax,
+    HLRatio, RSI, ROC, AwesomeOscillator, KAMA, TSI, VPT, UlcerIndex, SMA, EMAIndicator,
+    Features
+]}
@@ -0,0 +1,107 @@
+
+import os
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from cowboysmall.feature.graph import FEATURES, Graph, fields
+from cowboysmall.pool import SHARED, worker_pool
+
+
+
+# each worker attaches to the shared input and output blocks once, then
+# evaluates the feature graph over its slice of instruments in place
+
+
+
+class SharedGraph(Graph):
+
+    def __init__(self, block, names):
+        super().__init__(None, [])
+
+        self.block = block
+        self.names = names
+
+    def field(self, name):
+        return self.block[self.names.index(name)]
+
+
+
+def attach(name, shape):
+    memory = shared_memory.SharedMemory(name = name)
+
+    return memory, np.ndarray(shape, dtype = 'float64', buffer = memory.buf)
+
+
+def initialise(inputs, outputs, names, nodes):
+    SHARED['inputs']  = attach(*inputs)
+    SHARED['outputs'] = attach(*outputs)
+    SHARED['names']   = names
+    SHARED['nodes']   = nodes
+
+
+def run_shard(bounds):
+    lower, upper = bounds
+
+    _, inputs  = SHARED['inputs']
+    _, outputs = SHARED['outputs']
+
+    graph = SharedGraph(inputs[:, :, lower:upper], SHARED['names'])
+    for i, node in enumerate(SHARED['nodes']):
+        outputs[i, :, lower:upper] = graph.evaluate(node)
+
+    return upper - lower
+
+
+def shard_bounds(count, shards):
+    edges = np.linspace(0, count, min(shards, count) + 1).round().astype(int)
+
+    return [(int(lower), int(upper)) for lower, upper in zip(edges[:-1], edges[1:])]
+
+
+
+def parallel_features(inputs, nodes, workers = None, shards = None):
+    workers = workers or os.cpu_count()
+    names   = list(inputs)
+    length, count = next(iter(inputs.values())).shape
+
+    input_shape  = (len(names), length, count)
+    output_shape = (len(nodes), length, count)
+
+    input_memory  = shared_memory.SharedMemory(create = True, size = max(int(np.prod(input_shape)) * 8, 1))
+    output_memory = shared_memory.SharedMemory(create = True, size = max(int(np.prod(output_shape)) * 8, 1))
+
+    try:
+        block = np.ndarray(input_shape, dtype = 'float64', buffer = input_memory.buf)
+        for i, name in enumerate(names):
+            block[i] = inputs[name]
+        del block
+
+        arguments = ((input_memory.name, input_shape), (output_memory.name, output_shape), names, nodes)
+
+        # a few shards per worker keeps the pool busy when instruments differ in cost
+        with worker_pool(workers, initialise, arguments) as run:
+            run(run_shard, shard_bounds(count, 1 if workers == 1 else shards or workers * 4))
+
+        return np.ndarray(output_shape, dtype = 'float64', buffer = output_memory.buf).copy()
+    finally:
+        input_memory.close()
+        input_memory.unlink()
+        output_memory.close()
+        output_memory.unlink()
+
+
+def compute_parallel(data, instruments, names = tuple(FEATURES), features = FEATURES, workers = None, shards = None):
+    nodes  = [features[name] for name in names]
+    needed = list(dict.fromkeys(field for node in nodes for field in fields(node)))
+
+    inputs = {field: data[[f"{instrument}_{field}" for instrument in instruments]].to_numpy(dtype = 'float64') for field in needed}
+    result = parallel_features(inputs, nodes, workers, shards)
+
+    return pd.DataFrame(
+        result.transpose(1, 0, 2).reshape(len(data), -1),
+        index   = data.index,
+        columns = [f"{instrument}_{name}" for name in names for instrument in instruments]
+    )
@@ -0,0 +1,90 @@
+
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from cowboysmall.data.file import read_master_file
+from cowboysmall.data.store import read_columnar, write_columnar
+from cowboysmall.feature import ALL_COLS, engine, graph
+from cowboysmall.feature.graph import FEATURES, compute, split_column
+
+
+
+FEATURE_DIR = os.environ.get("COWBOYSMALL_FEATURES", "./data/features")
+MASTER      = "./data/processed/master_data"
+
+TARGETS = {
+    'NSEI_OPEN_DIR': lambda master: pd.Series(np.where(master["NSEI_OPEN"] > master["NSEI_CLOSE"].shift(), 1, 0), index = master.index)
+}
+
+
+
+def data_fingerprint(path = MASTER):
+    digest = hashlib.sha256()
+
+    with open(f"{path}.csv", "rb") as file:
+        for chunk in iter(lambda: file.read(1024 ** 2), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def code_fingerprint():
+    digest = hashlib.sha256()
+
+    # the modules that turn master data into features, this one included
+    for module in [engine, graph, sys.modules[__name__]]:
+        with open(module.__file__, "rb") as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+def feature_fingerprint(columns, target, features = FEATURES):
+    nodes = {}
+
+    for column in columns:
+        # raw master columns have no node and no parameters
+        try:
+            nodes[column] = repr(features[split_column(column, features)[1]])
+        except ValueError:
+            continue
+
+    return hashlib.sha256(json.dumps([list(columns), target, nodes]).encode()).hexdigest()
+
+
+def matrix_key(columns, target, path = MASTER):
+    parts = [data_fingerprint(path), code_fingerprint(), feature_fingerprint(columns, target)]
+
+    return hashlib.sha256("".join(parts).encode()).hexdigest()
+
+
+
+def build_matrix(master, columns = ALL_COLS, target = 'NSEI_OPEN_DIR'):
+    raw     = [column for column in columns if column in master.columns]
+    derived = [column for column in columns if column not in master.columns]
+
+    # tomorrow's target against today's features, as in the research scripts
+    data = pd.concat([
+        TARGETS[target](master).shift(-1).rename(target),
+        master[raw],
+        compute(master, derived)
+    ], axis = 1)[[target, *columns]]
+
+    return data.dropna()
+
+
+def design_matrix(columns = ALL_COLS, target = 'NSEI_OPEN_DIR', folder = FEATURE_DIR, refresh = False):
+    path = os.path.join(folder, matrix_key(columns, target))
+
+    # the schema is written last, so an entry with one is complete
+    if not refresh and os.path.exists(f"{path}.columnar/schema.json"):
+        return read_columnar(path)
+
+    os.makedirs(folder, exist_ok = True)
+
+    return write_columnar(build_matrix(read_master_file(), columns, target), path)
@@ -1,31 +1,101 @@
+import time
 
 import pandas as pd
-import numpy as np
 
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import roc_curve, roc_auc_score, accuracy_score
 
+from cowboysmall.model.metrics import classification_metrics
+from cowboysmall.pool import SHARED, worker_pool
 
-def imbalance_remedy_evaluation(remedy, model, X, y, seed = 1337):
+
+def resample(remedy, X, y):
     if remedy:
         X, y = remedy.fit_resample(X, y)
 
+    return X, y
+
+
+def model_evaluation(model, X, y, seed = 1337):
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size = 0.2, random_state = seed)
 
     model.fit(X_train, y_train)
     y_pred = model.predict_proba(X_test)
 
-    fpr, tpr, thresholds = roc_curve(y_test, y_pred[:, 1])
+    # auc, the youden threshold and the metrics at it from a single sort of the scores
+    summary = classification_metrics(y_test, y_pred[:, 1], decimals = 3)
 
     results = {}
-    results['AUC'] = roc_auc_score(y_test, y_pred[:, 1])
-    results['THRESHOLD'] = round(thresholds[np.argmax(tpr - fpr)], 3)
+    results['AUC'] = summary['AUC']
+    results['THRESHOLD'] = summary['THRESHOLD']
+    results['ACCURACY'] = summary['ACCURACY']
+    results['SENSITIVITY'] = round(summary['SENSITIVITY'] * 100, 2)
+    results['SPECIFICITY'] = round(summary['SPECIFICITY'] * 100, 2)
 
-    y_class = np.where(y_pred[:, 1] <= results['THRESHOLD'], 0, 1)
-    results['ACCURACY'] = accuracy_score(y_test, y_class)
+    return results
 
-    table = pd.crosstab(y_class, y_test)
-    results['SENSITIVITY'] = round((table.iloc[1, 1] / (table.iloc[0, 1] + table.iloc[1, 1])) * 100, 2)
-    results['SPECIFICITY'] = round((table.iloc[0, 0] / (table.iloc[0, 0] + table.iloc[1, 0])) * 100, 2)
 
-    return results
+def imbalance_remedy_evaluation(remedy, model, X, y, seed = 1337):
+    return model_evaluation(model, *resample(remedy, X, y), seed)
+
+
+
+# a grid of remedies x models x seeds - each task scores one model on one
+# resample, and a worker keeps only its latest resample, so the models of a
+# remedy and seed that land on the same worker resample once between them
+
+
+
+def seeded(estimator, seed):
+    estimator = clone(estimator)
+
+    # a random_state the caller chose is kept, only an unset one takes the seed
+    if estimator.get_params().get('random_state', False) is None:
+        estimator.set_params(random_state = seed)
+
+    return estimator
+
+
+def initialise_grid(X, y, remedies, models):
+    SHARED['X']        = X
+    SHARED['y']        = y
+    SHARED['remedies'] = remedies
+    SHARED['models']   = models
+
+
+def resampled(remedy, seed):
+    if SHARED.get('sampled', (None,))[0] == (remedy, seed):
+        return SHARED['sampled'][1], 0.0
+
+    # the previous resample is dropped before the next one is drawn
+    SHARED.pop('sampled', None)
+    estimator = SHARED['remedies'][remedy]
+
+    start   = time.perf_counter()
+    sampled = resample(None if estimator is None else seeded(estimator, seed), SHARED['X'], SHARED['y'])
+    elapsed = time.perf_counter() - start
+
+    SHARED['sampled'] = ((remedy, seed), sampled)
+
+    return sampled, elapsed
+
+
+def evaluate_cell(task):
+    remedy, seed, name = task
+    sampled, elapsed   = resampled(remedy, seed)
+
+    start   = time.perf_counter()
+    results = model_evaluation(seeded(SHARED['models'][name], seed), *sampled, seed)
+
+    return {'REMEDY': remedy, 'MODEL': name, 'SEED': seed, **results, 'RESAMPLE_SECONDS': elapsed, 'FIT_SECONDS': time.perf_counter() - start}
+
+
+def imbalance_remedy_grid(remedies, models, X, y, seeds = (1337,), workers = None):
+    tasks     = [(remedy, seed, name) for remedy in remedies for seed in seeds for name in models]
+    arguments = (X, y, dict(remedies), dict(models))
+
+    # the data goes to each worker once, tasks only carry their remedy, seed and model
+    with worker_pool(workers, initialise_grid, arguments) as run:
+        rows = run(evaluate_cell, tasks)
+
+    return pd.DataFrame(rows)
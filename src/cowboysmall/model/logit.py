@@ -1,76 +1,218 @@
 
+import os
+import time
+
+from contextlib import contextmanager
+
+import numpy as np
+
 from statsmodels.api import Logit
-from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+from cowboysmall.model.metrics import roc_auc
+from cowboysmall.model.solver import downdate, fit, fit_batch
+from cowboysmall.pool import SHARED, worker_pool
+
+
+
+def correlation_inverse(exog):
+    # the columns after the intercept
+    return np.linalg.inv(np.atleast_2d(np.corrcoef(exog[:, 1:], rowvar = False)))
+
+
+def variance_inflation_factors(exog):
+    # with an intercept, 1 / (1 - R^2) of each auxiliary regression is the
+    # diagonal of the inverse correlation matrix - every vif in one inversion
+    return np.diag(correlation_inverse(exog))
 
 
-def prune(X, y, verbose = True):
+
+def prune_stepwise(X, y, significance = True, colinearity = True, verbose = True, timings = None):
+    columns = list(X.columns)
+    exog    = X.to_numpy(dtype = 'float64')
+    endog   = np.asarray(y, dtype = 'float64')
+
+    current = list(range(len(columns)))
     dropped = []
+    params, inverse, correlation = None, None, None
     while True:
-        model = Logit(y, X).fit(disp = 0)
+        start = time.perf_counter()
+
+        # warm started from the previous fit without the dropped column
+        result = fit(exog, endog, current, params, inverse, columns)
+        values = result.pvalues
+
+        insignificant = [(result.names[i], values[i]) for i in range(1, len(current)) if values[i] > 0.05] if significance else []
 
-        insignificant = [p for p in zip(model.pvalues.index[1:], model.pvalues[1:]) if p[1] > 0.05]
+        colinear = []
+        if colinearity and not insignificant and len(current) > 1:
+            if correlation is None:
+                correlation = correlation_inverse(exog[:, current])
 
-        values   = [variance_inflation_factor(model.model.exog, i) for i in range(1, model.model.exog.shape[1])]
-        colinear = [val for val in zip(model.model.exog_names[1:], values) if val[1] > 5]
+            colinear = [(column, vif) for column, vif in zip(result.names[1:], np.diag(correlation)) if vif > 5]
 
         if insignificant:
-            insignificant.sort(key = lambda p: -p[1])
+            name, value = max(insignificant, key = lambda p: p[1])
+            reason      = 'p-value'
+        elif colinear:
+            name, value = max(colinear, key = lambda c: c[1])
+            reason      = 'vif'
+        else:
+            break
 
-            if verbose:
-                print(f"dropping {insignificant[0][0]} with p-value {insignificant[0][1]}")
+        index   = result.names.index(name)
+        elapsed = time.perf_counter() - start
 
-            X = X.drop([insignificant[0][0]], axis = 1)
-            dropped.append(insignificant[0][0])
+        if verbose:
+            print(f"dropping {name} with {reason} {value} - {result.iterations} iterations in {elapsed * 1000:.1f}ms")
 
-        elif colinear:
-            colinear.sort(key = lambda c: -c[1])
+        if timings is not None:
+            timings.append({'DROPPED': name, 'REASON': reason, 'VALUE': value, 'ITERATIONS': result.iterations, 'SECONDS': elapsed})
 
-            if verbose:
-                print(f"dropping {colinear[0][0]} with vif {colinear[0][1]}")
+        params  = np.delete(result.params, index)
+        inverse = downdate(result.covariance, index)
 
-            X = X.drop([colinear[0][0]], axis = 1)
-            dropped.append(colinear[0][0])
+        # the correlation matrix has no intercept row
+        if correlation is not None:
+            correlation = downdate(correlation, index - 1)
 
-        else:
-            return model, dropped
+        del current[index]
+        dropped.append(name)
 
+    # one statsmodels fit at the end, started at the solution, for the full results
+    model = Logit(y, X.drop(dropped, axis = 1)).fit(disp = 0, start_params = result.params)
 
-def prune_insignificant(X, y, verbose = True):
-    dropped = []
-    while True:
-        model = Logit(y, X).fit(disp = 0)
+    return model, dropped
 
-        insignificant = [p for p in zip(model.pvalues.index[1:], model.pvalues[1:]) if p[1] > 0.05]
 
-        if insignificant:
-            insignificant.sort(key = lambda p: -p[1])
+def prune(X, y, verbose = True, timings = None):
+    return prune_stepwise(X, y, True, True, verbose, timings)
 
-            if verbose:
-                print(f"dropping {insignificant[0][0]} with p-value {insignificant[0][1]}")
 
-            X = X.drop([insignificant[0][0]], axis = 1)
-            dropped.append(insignificant[0][0])
+def prune_insignificant(X, y, verbose = True, timings = None):
+    return prune_stepwise(X, y, True, False, verbose, timings)
 
-        else:
-            return model, dropped
 
+def prune_colinear(X, y, verbose = True, timings = None):
+    return prune_stepwise(X, y, False, True, verbose, timings)
 
-def prune_colinear(X, y, verbose = True):
-    dropped = []
-    while True:
-        model = Logit(y, X).fit(disp = 0)
 
-        values   = [variance_inflation_factor(model.model.exog, i) for i in range(1, model.model.exog.shape[1])]
-        colinear = [val for val in zip(model.model.exog_names[1:], values) if val[1] > 5]
 
-        if colinear:
-            colinear.sort(key = lambda c: -c[1])
+# stepwise selection by information criterion or validation auc - every
+# candidate submodel of a step is fitted concurrently, warm started from the
+# parent fit, and the best one becomes the parent of the next step
+
+CRITERIA = ['aic', 'bic', 'auc']
+
+
+
+def score(result, criterion, validation):
+    # lower is better, so auc is negated
+    if criterion == 'auc':
+        return -roc_auc(validation[1], validation[0][:, result.columns] @ result.params)
+
+    return getattr(result, criterion)
+
+
+def initialise_selection(exog, endog, criterion, validation):
+    SHARED['exog']       = exog
+    SHARED['endog']      = endog
+    SHARED['criterion']  = criterion
+    SHARED['validation'] = validation
+
+
+def fit_candidates(task):
+    subsets, starts, inverses = task
+
+    # the covariance is only needed for the winner, so the parent computes it
+    results = fit_batch(SHARED['exog'], SHARED['endog'], subsets, starts, inverses, covariance = False)
+
+    return [(score(result, SHARED['criterion'], SHARED['validation']), result.params, result.iterations) for result in results]
+
+
+def shard(tasks, shards):
+    bounds = np.linspace(0, len(tasks), min(shards, len(tasks)) + 1).round().astype(int)
+
+    return [tuple(list(part) for part in zip(*tasks[lower:upper])) for lower, upper in zip(bounds[:-1], bounds[1:])]
+
+
+@contextmanager
+def candidate_pool(workers, arguments):
+    shards = 1 if workers == 1 else workers * 4
+
+    # the design is sent to each worker once, candidates only carry their
+    # start, and each shard of candidates is fitted as one batch
+    with worker_pool(workers, initialise_selection, arguments) as run:
+        yield lambda tasks: [result for results in run(fit_candidates, shard(tasks, shards)) for result in results]
+
+
+
+def select(X, y, criterion = 'aic', direction = 'backward', validation = None, workers = None, verbose = True, timings = None):
+    if criterion not in CRITERIA:
+        raise ValueError(f"unknown selection criterion {criterion}")
+
+    if direction not in ('backward', 'forward'):
+        raise ValueError(f"unknown selection direction {direction}")
+
+    if criterion == 'auc' and validation is None:
+        raise ValueError("selection by auc needs a validation set")
+
+    columns = list(X.columns)
+    exog    = X.to_numpy(dtype = 'float64')
+    endog   = np.asarray(y, dtype = 'float64')
+
+    if validation is not None:
+        validation = (validation[0][columns].to_numpy(dtype = 'float64'), np.asarray(validation[1], dtype = 'float64'))
+
+    # the first column is the intercept and is always kept
+    current = list(range(len(columns))) if direction == 'backward' else [0]
+
+    result = fit(exog, endog, current)
+    value  = score(result, criterion, validation)
+
+    changed = []
+    with candidate_pool(workers or os.cpu_count(), (exog, endog, criterion, validation)) as evaluate:
+        while True:
+            start = time.perf_counter()
+
+            if direction == 'backward':
+                options = current[1:]
+                tasks   = [([column for column in current if column != option], np.delete(result.params, i + 1), downdate(result.covariance, i + 1)) for i, option in enumerate(options)]
+            else:
+                options = [column for column in range(len(columns)) if column not in current]
+                tasks   = [(current + [option], np.append(result.params, 0.0), None) for option in options]
+
+            if not tasks:
+                break
+
+            results = evaluate(tasks)
+            best    = min(range(len(results)), key = lambda i: results[i][0])
+
+            # an improvement in the last few digits is rounding, not a better model
+            if value - results[best][0] <= 1e-12 * abs(value):
+                break
+
+            value   = results[best][0]
+            current = tasks[best][0]
+            result  = fit(exog, endog, current, results[best][1])
+            changed.append(columns[options[best]])
+
+            elapsed = time.perf_counter() - start
 
             if verbose:
-                print(f"dropping {colinear[0][0]} with vif {colinear[0][1]}")
+                action = 'dropping' if direction == 'backward' else 'adding'
+                print(f"{action} {changed[-1]} with {criterion} {abs(value)} - {len(tasks)} candidates in {elapsed * 1000:.1f}ms")
 
-            X = X.drop([colinear[0][0]], axis = 1)
-            dropped.append(colinear[0][0])
+            if timings is not None:
+                timings.append({'CHANGED': changed[-1], 'CRITERION': criterion, 'VALUE': abs(value), 'CANDIDATES': len(tasks), 'ITERATIONS': sum(candidate[2] for candidate in results), 'SECONDS': elapsed})
 
-        else:
-            return model, dropped
+    model = Logit(y, X.iloc[:, current]).fit(disp = 0, start_params = result.params)
+
+    return model, changed
+
+
+def select_backward(X, y, criterion = 'aic', validation = None, workers = None, verbose = True, timings = None):
+    return select(X, y, criterion, 'backward', validation, workers, verbose, timings)
+
+
+def select_forward(X, y, criterion = 'aic', validation = None, workers = None, verbose = True, timings = None):
+    return select(X, y, criterion, 'forward', validation, workers, verbose, timings)
@@ -0,0 +1,179 @@
+
+import numpy as np
+
+
+
+# binary classification metrics from plain arrays - scores may be a single
+# vector or a (replicate x observation) matrix, so bootstrap replicates or
+# cross validation folds are scored in one call, and a class missing from
+# the data gives nan rather than an error
+
+def as_rows(y_true, values):
+    values = np.asarray(values, dtype = 'float64')
+    single = values.ndim == 1
+
+    values = np.atleast_2d(values)
+    y_true = np.broadcast_to(np.atleast_2d(np.asarray(y_true, dtype = 'float64')), values.shape)
+
+    return y_true, values, single
+
+
+def unwrap(values, single):
+    return values[0] if single else values
+
+
+
+def confusion_matrix(y_true, y_pred):
+    y_true, y_pred, single = as_rows(y_true, y_pred)
+
+    tp = np.sum(y_pred * y_true, axis = -1)
+    fp = np.sum(y_pred * (1 - y_true), axis = -1)
+    fn = np.sum((1 - y_pred) * y_true, axis = -1)
+    tn = y_true.shape[-1] - tp - fp - fn
+
+    # predicted class down the rows, actual class across, as pd.crosstab(y_pred, y_true)
+    return unwrap(np.stack([np.stack([tn, fn], axis = -1), np.stack([fp, tp], axis = -1)], axis = -2).astype(int), single)
+
+
+def accuracy(table):
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return (table[..., 0, 0] + table[..., 1, 1]) / table.sum(axis = (-2, -1))
+
+
+def sensitivity(table):
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return table[..., 1, 1] / (table[..., 0, 1] + table[..., 1, 1])
+
+
+def specificity(table):
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return table[..., 0, 0] / (table[..., 0, 0] + table[..., 1, 0])
+
+
+
+def ranked(y_true, scores):
+    # one sort, descending - every tied score takes the counts at the end of
+    # its tie, so each distinct threshold is one point on the roc curve
+    order  = np.argsort(-scores, axis = -1, kind = 'mergesort')
+    scores = np.take_along_axis(scores, order, axis = -1)
+    y_true = np.take_along_axis(y_true, order, axis = -1)
+
+    last = np.ones(scores.shape, dtype = bool)
+    last[:, :-1] = scores[:, 1:] != scores[:, :-1]
+
+    index = np.where(last, np.arange(scores.shape[-1]), scores.shape[-1])
+    ends  = np.minimum.accumulate(index[:, ::-1], axis = -1)[:, ::-1]
+
+    tps = np.take_along_axis(np.cumsum(y_true, axis = -1), ends, axis = -1)
+    fps = np.take_along_axis(np.cumsum(1 - y_true, axis = -1), ends, axis = -1)
+
+    return scores, last, tps, fps
+
+
+def rates(tps, fps):
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return tps / tps[..., -1:], fps / fps[..., -1:]
+
+
+def area(tpr, fpr):
+    tpr = np.pad(tpr, ((0, 0), (1, 0)))
+    fpr = np.pad(fpr, ((0, 0), (1, 0)))
+
+    return np.sum(np.diff(fpr, axis = -1) * (tpr[:, 1:] + tpr[:, :-1]) / 2, axis = -1)
+
+
+def youden(scores, last, tpr, fpr):
+    # the first maximum of tpr - fpr, behind the (0, 0) point at an infinite threshold
+    statistic = np.pad(np.where(last, tpr - fpr, -np.inf), ((0, 0), (1, 0)))
+    best      = np.argmax(statistic, axis = -1)
+
+    threshold = np.where(best == 0, np.inf, np.take_along_axis(scores, np.maximum(best - 1, 0)[:, None], axis = -1)[:, 0])
+
+    # with a class missing there is no curve, so no threshold
+    return np.where(np.isnan(statistic).any(axis = -1), np.nan, threshold)
+
+
+def curves(scores, last, tps, fps, drop_intermediate = True):
+    result = []
+
+    for row in range(len(scores)):
+        index = np.flatnonzero(last[row])
+        tp, fp, threshold = tps[row, index], fps[row, index], scores[row, index]
+
+        # as roc_curve - drop the points that sit on a straight run of the curve
+        if drop_intermediate and len(fp) > 2:
+            keep = np.r_[True, np.logical_or(np.diff(fp, 2), np.diff(tp, 2)), True]
+            tp, fp, threshold = tp[keep], fp[keep], threshold[keep]
+
+        tpr, fpr = rates(np.r_[0, tp], np.r_[0, fp])
+        result.append((fpr, tpr, np.r_[np.inf, threshold]))
+
+    return result
+
+
+def evaluate(y_true, scores, threshold = None, decimals = None, curve = False, drop_intermediate = True):
+    y_true, scores, single = as_rows(y_true, scores)
+
+    ordered, last, tps, fps = ranked(y_true, scores)
+    tpr, fpr                = rates(tps, fps)
+
+    if threshold is None:
+        threshold = youden(ordered, last, tpr, fpr)
+
+    threshold = np.broadcast_to(np.asarray(threshold, dtype = 'float64'), scores.shape[:1])
+    if decimals is not None:
+        threshold = np.array([round(value, decimals) for value in threshold])
+
+    # scores at or below the threshold are the negative class
+    table = confusion_matrix(y_true, (scores > threshold[:, None]).astype('float64'))
+
+    # without a threshold nothing is classified, so nothing is measured either
+    missing = np.isnan(threshold)
+
+    results = {
+        'AUC':         unwrap(area(tpr, fpr), single),
+        'THRESHOLD':   unwrap(threshold, single),
+        'ACCURACY':    unwrap(np.where(missing, np.nan, accuracy(table)), single),
+        'SENSITIVITY': unwrap(np.where(missing, np.nan, sensitivity(table)), single),
+        'SPECIFICITY': unwrap(np.where(missing, np.nan, specificity(table)), single),
+        'TABLE':       unwrap(table, single)
+    }
+
+    if curve:
+        fprs, tprs, thresholds = zip(*curves(ordered, last, tps, fps, drop_intermediate))
+
+        results['FPR']        = unwrap(list(fprs), single)
+        results['TPR']        = unwrap(list(tprs), single)
+        results['THRESHOLDS'] = unwrap(list(thresholds), single)
+
+    return results
+
+
+
+def roc_auc(y_true, scores):
+    y_true, scores, single = as_rows(y_true, scores)
+    _, _, tps, fps         = ranked(y_true, scores)
+
+    return unwrap(area(*rates(tps, fps)), single)
+
+
+def youden_threshold(y_true, scores):
+    y_true, scores, single  = as_rows(y_true, scores)
+    ordered, last, tps, fps = ranked(y_true, scores)
+
+    return unwrap(youden(ordered, last, *rates(tps, fps)), single)
+
+
+def roc_curve(y_true, scores, drop_intermediate = True):
+    y_true, scores, single = as_rows(y_true, scores)
+
+    return unwrap(curves(*ranked(y_true, scores), drop_intermediate), single)
+
+
+def classification_metrics(y_true, scores, threshold = None, decimals = None):
+    return evaluate(y_true, scores, threshold, decimals)
+
+
+def roc(y_true, scores, threshold = None, decimals = None, drop_intermediate = True):
+    # the curve, auc, youden threshold and the metrics at it, all from one sort
+    return evaluate(y_true, scores, threshold, decimals, True, drop_intermediate)
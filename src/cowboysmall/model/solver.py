@@ -0,0 +1,179 @@
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from scipy.special import expit
+from scipy.stats import norm
+
+from statsmodels.api import Logit
+
+
+
+# a lean logit solver - statsmodels' newton over column subsets of one
+# shared design array, with subsets of the same size fitted side by side as
+# one batch, and statsmodels only brought in when a summary is asked for
+
+RIDGE       = 1e-10
+BATCH_BYTES = 2 ** 21
+
+
+
+class Fit(namedtuple('Fit', ['exog', 'endog', 'columns', 'names', 'params', 'covariance', 'llf', 'iterations', 'converged'])):
+    __slots__ = ()
+
+    @property
+    def nobs(self):
+        return len(self.endog)
+
+    @property
+    def bse(self):
+        return np.sqrt(np.diag(self.covariance))
+
+    @property
+    def tvalues(self):
+        return self.params / self.bse
+
+    @property
+    def pvalues(self):
+        return 2 * norm.sf(np.abs(self.tvalues))
+
+    @property
+    def aic(self):
+        return -2 * self.llf + 2 * len(self.columns)
+
+    @property
+    def bic(self):
+        return -2 * self.llf + len(self.columns) * np.log(self.nobs)
+
+    def results(self):
+        # started at the solution, so statsmodels only confirms it
+        exog = pd.DataFrame(self.exog[:, self.columns], columns = self.names)
+
+        return Logit(pd.Series(self.endog, name = 'y'), exog).fit(disp = 0, start_params = self.params)
+
+    def summary(self):
+        return self.results().summary()
+
+
+
+def information(design, mu, ridge = RIDGE):
+    # with statsmodels' ridge on the diagonal, so badly scaled columns stay invertible
+    return (design * (mu * (1 - mu))[:, None, :]) @ design.transpose(0, 2, 1) + ridge * np.eye(design.shape[1])
+
+
+def likelihood(linear, y):
+    return np.sum(y * linear - np.logaddexp(0, linear), axis = -1)
+
+
+def predict(design, params):
+    return (params[:, None, :] @ design)[:, 0, :]
+
+
+def downdate(inverse, index):
+    keep = np.arange(len(inverse)) != index
+
+    # the inverse of a principal submatrix, from the Schur complement of the dropped entry
+    return inverse[np.ix_(keep, keep)] - np.outer(inverse[keep, index], inverse[index, keep]) / inverse[index, index]
+
+
+
+def newton(design, y, starts, inverses = None, tol = 1e-8, maxiter = 35):
+    # design is (subset x column x observation) - each subset stops on its
+    # own once no coefficient moves by more than tol, as statsmodels does
+    params = starts.copy()
+    linear = predict(design, params)
+    value  = likelihood(linear, y)
+
+    iterations = np.zeros(len(params), dtype = int)
+    converged  = np.zeros(len(params), dtype = bool)
+
+    active = np.arange(len(params))
+    for iteration in range(1, maxiter + 1):
+        subset   = design if len(active) == len(params) else design[active]
+        mu       = expit(linear[active])
+        gradient = (subset @ (y - mu)[:, :, None])[:, :, 0]
+
+        if iteration == 1 and inverses is not None:
+            step = (inverses @ gradient[:, :, None])[:, :, 0]
+        else:
+            step = np.linalg.solve(information(subset, mu), gradient[:, :, None])[:, :, 0]
+
+        move      = predict(subset, step)
+        previous  = value[active]
+        candidate = likelihood(linear[active] + move, y)
+
+        # a warm start can sit far from the optimum - halve the step until it improves
+        for _ in range(30):
+            worse = candidate < previous - 1e-12 * np.abs(previous)
+            if not worse.any():
+                break
+
+            step[worse]      /= 2
+            move[worse]      /= 2
+            candidate[worse]  = likelihood(linear[active][worse] + move[worse], y)
+
+        params[active] += step
+        linear[active] += move
+        value[active]   = candidate
+
+        iterations[active] = iteration
+
+        done = np.all(np.abs(step) <= tol, axis = 1)
+        converged[active[done]] = True
+
+        active = active[~done]
+        if not len(active):
+            break
+
+    return params, value, iterations, converged
+
+
+
+def fit_batch(exog, endog, subsets, starts = None, inverses = None, names = None, tol = 1e-8, maxiter = 35, covariance = True):
+    if isinstance(exog, pd.DataFrame):
+        names = list(exog.columns) if names is None else names
+        exog  = exog.to_numpy(dtype = 'float64')
+
+    exog  = np.asarray(exog, dtype = 'float64')
+    endog = np.asarray(endog, dtype = 'float64')
+    names = [f"x{i}" for i in range(exog.shape[1])] if names is None else list(names)
+
+    subsets    = [list(subset) for subset in subsets]
+    transposed = np.ascontiguousarray(exog.T)
+
+    # subsets of one size share a batch, in chunks small enough to stay in cache
+    sizes = {}
+    for i, subset in enumerate(subsets):
+        sizes.setdefault(len(subset), []).append(i)
+
+    fits = [None] * len(subsets)
+    for size, members in sizes.items():
+        chunk = max(BATCH_BYTES // max(size * len(endog) * 8, 1), 1)
+
+        for lower in range(0, len(members), chunk):
+            batch  = members[lower:lower + chunk]
+            design = transposed[np.array([subsets[i] for i in batch], dtype = int).reshape(len(batch), size)]
+
+            start   = np.zeros((len(batch), size)) if starts is None else np.array([starts[i] for i in batch], dtype = 'float64').reshape(len(batch), size)
+            inverse = None if inverses is None or any(inverses[i] is None for i in batch) else np.array([inverses[i] for i in batch], dtype = 'float64')
+
+            params, llf, iterations, converged = newton(design, endog, start, inverse, tol, maxiter)
+
+            covariances = [None] * len(batch)
+            if covariance:
+                covariances = np.linalg.inv(information(design, expit(predict(design, params))))
+
+            for j, i in enumerate(batch):
+                fits[i] = Fit(exog, endog, subsets[i], [names[column] for column in subsets[i]], params[j], covariances[j], float(llf[j]), int(iterations[j]), bool(converged[j]))
+
+    return fits
+
+
+def fit(exog, endog, columns = None, start = None, inverse = None, names = None, tol = 1e-8, maxiter = 35, covariance = True):
+    columns  = range(np.shape(exog)[1]) if columns is None else columns
+    starts   = None if start is None else [start]
+    inverses = None if inverse is None else [inverse]
+
+    return fit_batch(exog, endog, [columns], starts, inverses, names, tol, maxiter, covariance)[0]
@@ -0,0 +1,30 @@
+
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+
+
+# the process pool scaffolding shared by the feature, selection and grid
+# harnesses - the initialiser puts the large read only arguments in SHARED
+# once per worker, so tasks only carry what differs between them, and a
+# single worker runs the tasks inline in this process instead
+
+SHARED = {}
+
+
+
+@contextmanager
+def worker_pool(workers, initialiser, arguments):
+    workers = workers or os.cpu_count()
+
+    if workers == 1:
+        initialiser(*arguments)
+        try:
+            yield lambda function, tasks: list(map(function, tasks))
+        finally:
+            SHARED.clear()
+    else:
+        with ProcessPoolExecutor(workers, initializer = initialiser, initargs = arguments) as pool:
+            yield lambda function, tasks: list(pool.map(function, tasks))
@@ -0,0 +1,121 @@
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cowboysmall.data import cache as cache_module
+from cowboysmall.data.cache import Cache
+from cowboysmall.data.index import retrieve_data
+
+
+
+class Clock:
+    # a stand-in for the time module, moved on by hand
+
+    def __init__(self, now = 1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+
+def frame(seed, rows = 200):
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame({'CLOSE': rng.normal(size = rows)}, index = pd.bdate_range('2024-01-01', periods = rows, name = 'Date'))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+
+    return clock
+
+
+@pytest.fixture
+def folder(tmp_path):
+    return str(tmp_path / "cache")
+
+
+
+def test_put_then_get(folder, clock):
+    cache = Cache(folder)
+    key   = cache.key('NSEI', '2024-01-01', '2024-01-31')
+
+    assert cache.get(key) is None
+
+    cache.put(key, frame(1))
+    pd.testing.assert_frame_equal(cache.get(key), frame(1))
+
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_the_ttl(folder, clock):
+    cache = Cache(folder, ttl = 60)
+    cache.put('a', frame(1))
+
+    clock.now += 30
+    assert cache.get('a') is not None
+
+    clock.now += 31
+    assert cache.get('a') is None
+
+    # the next put clears the expired entry out
+    cache.put('b', frame(2))
+    assert list(cache.entries) == ['b']
+    assert not os.path.exists(cache.file('a'))
+
+
+def test_least_recently_used_entries_are_evicted_by_size(folder, clock):
+    cache = Cache(folder)
+    cache.put('a', frame(1))
+    cache.max_bytes = 2 * cache.entries['a']['size'] + 100
+
+    clock.now += 1
+    cache.put('b', frame(2))
+
+    clock.now += 1
+    cache.get('a')
+
+    clock.now += 1
+    cache.put('c', frame(3))
+
+    assert set(cache.entries) == {'a', 'c'}
+    assert not os.path.exists(cache.file('b'))
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_offline_serves_stale_entries(folder, clock):
+    Cache(folder, ttl = 60).put('a', frame(1))
+
+    clock.now += 120
+    assert Cache(folder, ttl = 60).get('a') is None
+
+    pd.testing.assert_frame_equal(Cache(folder, ttl = 60, offline = True).get('a'), frame(1))
+
+
+def test_offline_miss_raises(folder):
+    def download(*args, **kwargs):
+        raise AssertionError("an offline cache must not download")
+
+    with pytest.raises(KeyError):
+        retrieve_data('NSEI', '2024-01-01', '2024-01-31', download = download, cache = Cache(folder, offline = True))
+
+
+def test_entries_survive_a_reopen(folder, clock):
+    cache = Cache(folder)
+    cache.put('a', frame(1))
+    cache.put('b', frame(2))
+
+    os.remove(cache.file('b'))
+
+    # an entry whose file is gone is dropped on the way in
+    reopened = Cache(folder)
+
+    assert list(reopened.entries) == ['a']
+    pd.testing.assert_frame_equal(reopened.get('a'), frame(1))
@@ -0,0 +1,120 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ta
+
+from cowboysmall.feature import engine
+
+
+
+INDICATORS = {
+    'RSI': (lambda c, h, l, v: ta.momentum.rsi(c),                    lambda c, h, l, v: engine.rsi(c)),
+    'ROC': (lambda c, h, l, v: ta.momentum.roc(c),                    lambda c, h, l, v: engine.roc(c)),
+    'AWE': (lambda c, h, l, v: ta.momentum.awesome_oscillator(h, l),  lambda c, h, l, v: engine.awesome_oscillator(h, l)),
+    'KAM': (lambda c, h, l, v: ta.momentum.kama(c),                   lambda c, h, l, v: engine.kama(c)),
+    'TSI': (lambda c, h, l, v: ta.momentum.tsi(c),                    lambda c, h, l, v: engine.tsi(c)),
+    'VPT': (lambda c, h, l, v: ta.volume.volume_price_trend(c, v),    lambda c, h, l, v: engine.volume_price_trend(c, v)),
+    'ULC': (lambda c, h, l, v: ta.volatility.ulcer_index(c),          lambda c, h, l, v: engine.ulcer_index(c)),
+    'SMA': (lambda c, h, l, v: ta.trend.sma_indicator(c),             lambda c, h, l, v: engine.sma_indicator(c)),
+    'EMA': (lambda c, h, l, v: ta.trend.ema_indicator(c),             lambda c, h, l, v: engine.ema_indicator(c)),
+    'ULY': (lambda c, h, l, v: ta.volatility.ulcer_index(c, 250),     lambda c, h, l, v: engine.ulcer_index(c, 250))
+}
+
+BANDS = ['hband', 'lband', 'mband', 'wband', 'pband']
+
+SWEEPS = {
+    'RSI': ([7, 14, 21, 28],     ta.momentum.rsi,        engine.rsi,           engine.rsi_sweep),
+    'SMA': (range(5, 201, 15),   ta.trend.sma_indicator, engine.sma_indicator, engine.sma_sweep),
+    'EMA': (range(5, 201, 15),   ta.trend.ema_indicator, engine.ema_indicator, engine.ema_sweep),
+    'ROC': (range(5, 61, 5),     ta.momentum.roc,        engine.roc,           engine.roc_sweep)
+}
+
+
+
+def synthetic(count, length, seed = 1337):
+    rng   = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size = (length, count)), axis = 0))
+
+    # staggered listings, and the odd missing bar
+    for i in range(count):
+        close[:rng.integers(0, length // 8), i] = np.nan
+    close[rng.integers(length // 8, length, size = 3), ::2] = np.nan
+
+    high   = close * (1 + rng.uniform(0, 0.02, size = close.shape))
+    low    = close * (1 - rng.uniform(0, 0.02, size = close.shape))
+    volume = rng.integers(100000, 1000000, size = close.shape).astype('float64')
+
+    return close, high, low, volume
+
+
+def per_column(indicator, arrays):
+    return np.column_stack([
+        indicator(*[pd.Series(array[:, i]) for array in arrays]).to_numpy()
+        for i in range(arrays[0].shape[1])
+    ])
+
+
+
+@pytest.mark.parametrize('name', list(INDICATORS))
+def test_engine_matches_ta(name):
+    arrays = synthetic(5, 400)
+    ta_indicator, engine_indicator = INDICATORS[name]
+
+    np.testing.assert_allclose(engine_indicator(*arrays), per_column(ta_indicator, arrays), rtol = 1e-9, atol = 1e-9, equal_nan = True)
+
+
+@pytest.mark.parametrize('band', BANDS)
+@pytest.mark.parametrize('window', [20, 250])
+def test_donchian_channel_matches_ta(band, window):
+    close, high, low, _ = synthetic(5, 1000)
+
+    ta_indicator     = getattr(ta.volatility, f"donchian_channel_{band}")
+    engine_indicator = getattr(engine, f"donchian_channel_{band}")
+
+    expected = per_column(lambda h, l, c: ta_indicator(h, l, c, window), [high, low, close])
+
+    np.testing.assert_allclose(engine_indicator(high, low, close, window), expected, rtol = 1e-9, atol = 1e-9, equal_nan = True)
+
+
+@pytest.mark.parametrize('window', [2, 7, 250, 2000])
+@pytest.mark.parametrize('min_periods', [None, 1, 2])
+def test_rolling_extremes_match_pandas(window, min_periods):
+    close = synthetic(5, 1000)[0]
+
+    # the kernel pads to whole blocks, so windows longer than the series too
+    rolling = pd.DataFrame(close).rolling(window, min_periods = min_periods)
+
+    np.testing.assert_array_equal(engine.rolling_max(close, window, min_periods), rolling.max().to_numpy())
+    np.testing.assert_array_equal(engine.rolling_min(close, window, min_periods), rolling.min().to_numpy())
+
+
+@pytest.mark.parametrize('name', list(INDICATORS))
+def test_engine_handles_series_shorter_than_the_window(name):
+    arrays = synthetic(3, 10)
+    ta_indicator, engine_indicator = INDICATORS[name]
+
+    np.testing.assert_allclose(engine_indicator(*arrays), per_column(ta_indicator, arrays), rtol = 1e-9, atol = 1e-9, equal_nan = True)
+
+
+@pytest.mark.parametrize('name', list(SWEEPS))
+def test_sweep_matches_the_engine_window_by_window(name):
+    close = synthetic(5, 400)[0]
+    windows, _, engine_indicator, sweep = SWEEPS[name]
+    windows = np.array(list(windows))
+
+    looped = np.stack([engine_indicator(close, window) for window in windows], axis = -1)
+
+    np.testing.assert_array_equal(sweep(close, windows), looped)
+
+
+@pytest.mark.parametrize('name', list(SWEEPS))
+def test_sweep_matches_ta(name):
+    close = synthetic(3, 400)[0]
+    windows, ta_indicator, _, sweep = SWEEPS[name]
+    windows = np.array(list(windows))
+
+    expected = np.stack([per_column(lambda c: ta_indicator(c, window), [close]) for window in windows], axis = -1)
+
+    np.testing.assert_allclose(sweep(close, windows), expected, rtol = 1e-9, atol = 1e-9, equal_nan = True)
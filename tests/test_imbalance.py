@@ -0,0 +1,92 @@
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from sklearn.tree import DecisionTreeClassifier
+
+from imblearn.over_sampling import SMOTE, RandomOverSampler
+from imblearn.under_sampling import RandomUnderSampler
+
+from cowboysmall.model.imbalance import imbalance_remedy_evaluation, imbalance_remedy_grid, seeded
+from cowboysmall.pool import SHARED
+
+
+
+SEEDS   = [0, 1]
+METRICS = ['AUC', 'THRESHOLD', 'ACCURACY', 'SENSITIVITY', 'SPECIFICITY']
+
+REMEDIES = {
+    'none':               None,
+    'RandomUnderSampler': RandomUnderSampler(),
+    'RandomOverSampler':  RandomOverSampler(),
+    'SMOTE':              SMOTE()
+}
+
+MODELS = {
+    'LogisticRegression':     LogisticRegression(max_iter = 1000),
+    'GaussianNB':             GaussianNB(),
+    'DecisionTreeClassifier': DecisionTreeClassifier(max_depth = 5)
+}
+
+
+
+def synthetic(rows = 600, seed = 1337):
+    rng = np.random.default_rng(seed)
+
+    # roughly the 68 / 32 split of the nifty open direction
+    X = pd.DataFrame(rng.normal(size = (rows, 6)), columns = [f"X{i}" for i in range(6)])
+    y = pd.Series((rng.random(rows) < 1 / (1 + np.exp(-(0.9 + X.to_numpy() @ np.linspace(1.0, 0.0, 6))))).astype(int), name = 'y')
+
+    return X, y
+
+
+def naive_grid(X, y):
+    rows = []
+
+    for remedy, estimator in REMEDIES.items():
+        for seed in SEEDS:
+            for name, model in MODELS.items():
+                results = imbalance_remedy_evaluation(None if estimator is None else seeded(estimator, seed), seeded(model, seed), X, y, seed)
+                rows.append({'REMEDY': remedy, 'MODEL': name, 'SEED': seed, **results})
+
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(autouse = True)
+def quiet():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_grid_matches_per_cell_evaluations(workers):
+    X, y     = synthetic()
+    expected = naive_grid(X, y)
+
+    actual = imbalance_remedy_grid(REMEDIES, MODELS, X, y, SEEDS, workers = workers)
+
+    pd.testing.assert_frame_equal(actual[['REMEDY', 'MODEL', 'SEED']], expected[['REMEDY', 'MODEL', 'SEED']])
+    np.testing.assert_allclose(actual[METRICS].to_numpy(), expected[METRICS].to_numpy())
+
+
+def test_grid_resamples_once_per_remedy_and_seed_inline():
+    X, y   = synthetic()
+    actual = imbalance_remedy_grid(REMEDIES, MODELS, X, y, SEEDS, workers = 1)
+
+    resampled = actual[actual.REMEDY != 'none'].groupby(['REMEDY', 'SEED']).RESAMPLE_SECONDS
+
+    assert (resampled.apply(lambda seconds: (seconds > 0).sum()) == 1).all()
+    assert not SHARED
+
+
+def test_seeded_keeps_a_chosen_random_state():
+    assert seeded(SMOTE(random_state = 7), 1).random_state == 7
+    assert seeded(SMOTE(), 1).random_state == 1
+    assert 'random_state' not in seeded(GaussianNB(), 1).get_params()
@@ -0,0 +1,141 @@
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cowboysmall.data.cache import Cache
+from cowboysmall.data.index import LIMITERS, RateLimiter, retrieve_many, retrieve_update
+
+
+
+LATENCY = 0.2
+
+
+
+class StandIn:
+    # a local yfinance.download - every call sleeps for the latency, and a
+    # ticker fails as many times as it is given in failures before it succeeds
+
+    def __init__(self, latency = LATENCY, failures = None):
+        self.latency  = latency
+        self.failures = dict(failures or {})
+        self.calls    = {}
+        self.lock     = threading.Lock()
+
+    def __call__(self, ticker, start_date, end_date, progress = False):
+        # index tickers arrive with yahoo's caret
+        ticker = ticker.lstrip('^')
+
+        with self.lock:
+            self.calls[ticker] = self.calls.get(ticker, 0) + 1
+            fail = self.calls[ticker] <= self.failures.get(ticker, 0)
+
+        time.sleep(self.latency)
+
+        if fail:
+            raise ConnectionError(f"transient failure retrieving {ticker}")
+
+        dates = pd.bdate_range(start_date, end_date, name = 'Date')
+        close = 100 + np.arange(len(dates), dtype = 'float64')
+
+        return pd.DataFrame({
+            'Open':      close,
+            'High':      close * 1.01,
+            'Low':       close * 0.99,
+            'Close':     close,
+            'Adj Close': close,
+            'Volume':    np.full(len(dates), 1000)
+        }, index = dates)
+
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    def install(rate):
+        monkeypatch.setitem(LIMITERS, 'stand-in', RateLimiter(rate))
+
+    install(1000.0)
+
+    return install
+
+
+
+def test_retrieve_many_overlaps_latency(limiter):
+    download = StandIn()
+    indices  = [f"T{i}" for i in range(8)]
+
+    start = time.perf_counter()
+    retrieved, failed = retrieve_many(indices, '2024-01-01', '2024-01-31', workers = 8, source = 'stand-in', download = download)
+    elapsed = time.perf_counter() - start
+
+    assert not failed
+    assert list(retrieved) == indices
+    assert elapsed < len(indices) * LATENCY / 2
+
+    data = retrieved['T0']
+    assert 'T0_CLOSE' in data.columns
+    assert np.isnan(data['T0_DAILY_RETURNS'].iloc[0])
+    assert np.isclose(data['T0_DAILY_RETURNS'].iloc[1], 1.0)
+
+
+def test_retrieve_many_retries_transient_failures(limiter):
+    download = StandIn(latency = 0.0, failures = {'T0': 2})
+
+    retrieved, failed = retrieve_many(['T0', 'T1'], '2024-01-01', '2024-01-31', source = 'stand-in', retries = 3, backoff = 0.0, download = download)
+
+    assert not failed
+    assert set(retrieved) == {'T0', 'T1'}
+    assert download.calls == {'T0': 3, 'T1': 1}
+
+
+def test_retrieve_many_reports_partial_failures(limiter):
+    download = StandIn(latency = 0.0, failures = {'T1': 10})
+
+    retrieved, failed = retrieve_many(['T0', 'T1', 'T2'], '2024-01-01', '2024-01-31', source = 'stand-in', retries = 2, backoff = 0.0, download = download)
+
+    assert set(retrieved) == {'T0', 'T2'}
+    assert list(failed) == ['T1']
+    assert isinstance(failed['T1'], ConnectionError)
+    assert download.calls['T1'] == 3
+
+
+def test_retrieve_many_is_rate_limited(limiter):
+    limiter(20.0)
+    download = StandIn(latency = 0.0)
+
+    start = time.perf_counter()
+    retrieve_many([f"T{i}" for i in range(6)], '2024-01-01', '2024-01-31', workers = 6, source = 'stand-in', download = download)
+
+    # six requests at twenty a second are spread over at least five intervals
+    assert time.perf_counter() - start >= 5 / 20.0 - 0.01
+
+
+def test_retrieve_many_counts_one_miss_per_request(limiter, tmp_path):
+    download = StandIn(latency = 0.0, failures = {'T0': 2})
+    cache    = Cache(str(tmp_path))
+
+    retrieve_many(['T0', 'T1'], '2024-01-01', '2024-01-31', source = 'stand-in', backoff = 0.0, download = download, cache = cache)
+    assert cache.stats()['misses'] == 2
+
+    retrieved, failed = retrieve_many(['T0', 'T1'], '2024-01-01', '2024-01-31', source = 'stand-in', download = download, cache = cache)
+
+    assert not failed
+    assert cache.stats()['hits'] == 2
+    assert download.calls == {'T0': 3, 'T1': 1}
+
+
+def test_retrieve_update_continues_from_the_last_row():
+    download = StandIn(latency = 0.0)
+    last     = pd.DataFrame({'T0_CLOSE': [50.0], 'T0_DAILY_RETURNS': [0.0]}, index = pd.DatetimeIndex(['2024-01-05'], name = 'Date'))
+
+    data = retrieve_update('T0', last, '2024-01-31', download = download)
+
+    assert data.index[0] > last.index[-1]
+    assert data.index[-1] <= pd.Timestamp('2024-01-31')
+
+    # the first return is against the stored close, the rest against the new ones
+    assert np.isclose(data['T0_DAILY_RETURNS'].iloc[0], (data['T0_CLOSE'].iloc[0] / 50.0 - 1) * 100)
+    assert np.isclose(data['T0_DAILY_RETURNS'].iloc[1], (data['T0_CLOSE'].iloc[1] / data['T0_CLOSE'].iloc[0] - 1) * 100)
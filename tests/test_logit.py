@@ -0,0 +1,216 @@
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sklearn.metrics import roc_auc_score
+
+from statsmodels.api import Logit
+from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+from cowboysmall.model.logit import correlation_inverse, downdate, prune, select, variance_inflation_factors
+
+
+
+def logit_data(features, rows, seed = 1337, weights = np.linspace(0.8, 0.1, 5)):
+    rng = np.random.default_rng(seed)
+
+    # five informative columns, five near copies of them, the rest noise
+    X = rng.normal(size = (rows, features))
+    X[:, 5:10] = X[:, :5] + rng.normal(0, 0.3, size = (rows, 5))
+
+    linear = 0.2 + X[:, :5] @ weights
+    y      = pd.Series((rng.random(rows) < 1 / (1 + np.exp(-linear))).astype(int))
+
+    X = pd.DataFrame(X, columns = [f"X{i:02d}" for i in range(features)])
+    X.insert(0, 'Intercept', 1.0)
+
+    return X, y
+
+
+def colinear_data(features, rows, seed = 1337):
+    rng = np.random.default_rng(seed)
+
+    # half the columns are noisy copies of the other half
+    X = rng.normal(size = (rows, features))
+    X[:, features // 2:] = X[:, :features - features // 2] + rng.normal(0, 0.3, size = (rows, features - features // 2))
+
+    return np.column_stack([np.ones(rows), X])
+
+
+def eliminate_recomputed(exog, threshold = 5):
+    dropped = []
+    columns = list(range(1, exog.shape[1]))
+
+    while len(columns) > 1:
+        vifs  = variance_inflation_factors(exog)
+        worst = int(np.argmax(vifs))
+        if vifs[worst] <= threshold:
+            break
+
+        exog = np.delete(exog, worst + 1, axis = 1)
+        dropped.append(columns.pop(worst))
+
+    return dropped, variance_inflation_factors(exog)
+
+
+def eliminate_downdated(exog, threshold = 5):
+    dropped = []
+    columns = list(range(1, exog.shape[1]))
+    inverse = correlation_inverse(exog)
+
+    while len(inverse) > 1:
+        vifs  = np.diag(inverse)
+        worst = int(np.argmax(vifs))
+        if vifs[worst] <= threshold:
+            break
+
+        inverse = downdate(inverse, worst)
+        dropped.append(columns.pop(worst))
+
+    return dropped, np.diag(inverse)
+
+
+def prune_refit(X, y):
+    dropped = []
+
+    while True:
+        model = Logit(y, X.drop(dropped, axis = 1)).fit(disp = 0)
+
+        insignificant = [(column, value) for column, value in model.pvalues.iloc[1:].items() if value > 0.05]
+        if insignificant:
+            dropped.append(max(insignificant, key = lambda p: p[1])[0])
+            continue
+
+        exog     = model.model.exog
+        colinear = [(column, variance_inflation_factor(exog, i)) for i, column in enumerate(model.model.exog_names) if i > 0]
+        colinear = [(column, vif) for column, vif in colinear if vif > 5]
+        if colinear:
+            dropped.append(max(colinear, key = lambda c: c[1])[0])
+            continue
+
+        return model, dropped
+
+
+def naive_score(X, y, columns, criterion, validation):
+    model = Logit(y, X[columns]).fit(disp = 0)
+
+    if criterion == 'auc':
+        return -roc_auc_score(validation[1], model.predict(validation[0][columns]))
+
+    return getattr(model, criterion)
+
+
+def naive_select(X, y, criterion, direction, validation):
+    columns = list(X.columns)
+    current = list(columns) if direction == 'backward' else columns[:1]
+    value   = naive_score(X, y, current, criterion, validation)
+
+    changed = []
+    while True:
+        if direction == 'backward':
+            options    = current[1:]
+            candidates = [[column for column in current if column != option] for option in options]
+        else:
+            options    = [column for column in columns if column not in current]
+            candidates = [current + [option] for option in options]
+
+        if not candidates:
+            break
+
+        scores = [naive_score(X, y, candidate, criterion, validation) for candidate in candidates]
+        best   = int(np.argmin(scores))
+        if scores[best] >= value:
+            break
+
+        value   = scores[best]
+        current = candidates[best]
+        changed.append(options[best])
+
+    return changed
+
+
+@pytest.fixture(autouse = True)
+def quiet():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+
+@pytest.mark.parametrize('features', [2, 25, 100])
+def test_vifs_match_statsmodels(features):
+    exog = colinear_data(features, 1000)
+
+    expected = [variance_inflation_factor(exog, i) for i in range(1, exog.shape[1])]
+
+    np.testing.assert_allclose(variance_inflation_factors(exog), expected, rtol = 1e-9)
+
+
+@pytest.mark.parametrize('features', [25, 100])
+def test_downdated_elimination_matches_a_recomputed_one(features):
+    exog = colinear_data(features, 1000)
+
+    expected_dropped, expected = eliminate_recomputed(exog)
+    actual_dropped,   actual   = eliminate_downdated(exog)
+
+    assert len(actual_dropped) > 0
+    assert actual_dropped == expected_dropped
+    np.testing.assert_allclose(actual, expected, rtol = 1e-9)
+
+
+@pytest.mark.parametrize('features', [10, 25])
+def test_prune_matches_a_naive_refit(features):
+    X, y = logit_data(features, 3000, weights = np.linspace(0.8, 0.2, 5))
+
+    expected, expected_dropped = prune_refit(X, y)
+    actual,   actual_dropped   = prune(X, y, verbose = False)
+
+    assert actual_dropped == expected_dropped
+    np.testing.assert_allclose(actual.params, expected.params, atol = 1e-6)
+
+
+@pytest.mark.parametrize('criterion', ['aic', 'bic', 'auc'])
+@pytest.mark.parametrize('direction', ['backward', 'forward'])
+def test_select_matches_a_naive_refit(criterion, direction):
+    X, y       = logit_data(12, 1200)
+    validation = logit_data(12, 400, seed = 7)
+
+    _, changed = select(X, y, criterion, direction, validation, workers = 1, verbose = False)
+
+    assert changed == naive_select(X, y, criterion, direction, validation)
+
+
+def test_select_ignores_rounding_improvements():
+    X, y       = logit_data(15, 600, seed = 1)
+    validation = logit_data(15, 300, seed = 101)
+
+    # two of the late steps here only move the validation auc in its last digits
+    _, changed = select(X, y, 'auc', 'backward', validation, workers = 1, verbose = False)
+
+    assert changed == naive_select(X, y, 'auc', 'backward', validation)
+
+
+def test_select_pool_matches_serial():
+    X, y       = logit_data(12, 1200)
+    validation = logit_data(12, 400, seed = 7)
+
+    _, serial = select(X, y, 'auc', 'backward', validation, workers = 1, verbose = False)
+    _, pooled = select(X, y, 'auc', 'backward', validation, workers = 2, verbose = False)
+
+    assert pooled == serial
+
+
+def test_select_rejects_unknown_arguments():
+    X, y = logit_data(12, 200)
+
+    with pytest.raises(ValueError):
+        select(X, y, 'r2', verbose = False)
+
+    with pytest.raises(ValueError):
+        select(X, y, direction = 'sideways', verbose = False)
+
+    with pytest.raises(ValueError):
+        select(X, y, 'auc', verbose = False)
@@ -0,0 +1,57 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cowboysmall.data.master import extend_data, merge_data
+
+
+
+def index_frame(name, start, end, seed, skip = 0.1):
+    rng   = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, end, name = 'Date').as_unit('ns')
+    dates = dates[rng.random(len(dates)) > skip]
+
+    return pd.DataFrame({f"{name}_CLOSE": 100 + rng.normal(size = len(dates)).cumsum()}, index = dates)
+
+
+@pytest.fixture
+def raw():
+    return [index_frame(name, '2017-12-01', '2018-06-29', seed) for seed, name in enumerate(['AAA', 'BBB', 'CCC'])]
+
+
+
+def test_merge_matches_concat_and_ffill(raw):
+    expected = pd.concat(raw, axis = 1, sort = True).ffill().loc['2018-01-02':'2018-05-31']
+    merged   = merge_data(raw, '2018-01-02', '2018-05-31')
+
+    pd.testing.assert_frame_equal(merged[expected.columns], expected, check_freq = False)
+
+
+def test_merge_resolves_partial_end_dates(raw):
+    merged = merge_data(raw, '2018-01', '2018-02')
+
+    assert merged.index[0] >= pd.Timestamp('2018-01-01')
+    assert merged.index[-1].month == 2
+    assert merged.index[-1] == pd.concat(raw, axis = 1, sort = True).loc[:'2018-02'].index[-1]
+
+
+def test_extend_matches_a_full_merge(raw):
+    master = merge_data(raw, '2018-01-02', '2018-03-30')
+    last   = master.iloc[-1:]
+
+    # every raw row after the master's last date, not just the latest update
+    data     = [frame[frame.index > last.index[-1]] for frame in raw]
+    extended = extend_data(last, data, end_date = '2018-06-29')
+
+    pd.testing.assert_frame_equal(extended, merge_data(raw, '2018-01-02', '2018-06-29').loc['2018-04-01':], check_freq = False)
+
+
+def test_extend_refuses_a_gap(raw):
+    master = merge_data(raw, '2018-01-02', '2018-03-30')
+
+    # only the rows from june, as if may had never been merged
+    data = [frame[frame.index >= '2018-06-01'] for frame in raw]
+
+    with pytest.raises(ValueError):
+        extend_data(master.iloc[-1:], data)
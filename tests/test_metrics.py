@@ -0,0 +1,113 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sklearn.metrics import roc_auc_score, roc_curve
+
+from cowboysmall.model.metrics import classification_metrics, roc, roc_auc
+
+
+
+METRICS = ['AUC', 'THRESHOLD', 'ACCURACY', 'SENSITIVITY', 'SPECIFICITY']
+
+
+
+def scored(count, rows, seed = 1337, decimals = 3):
+    rng = np.random.default_rng(seed)
+
+    # a separation that varies by row, rounded so every row has tied scores
+    y      = (rng.random(rows) < 0.68).astype(int)
+    shift  = rng.uniform(0.05, 0.3, size = (count, 1))
+    scores = np.clip(0.5 + shift * (y - 0.5) + rng.normal(0, 0.25, size = (count, rows)), 0, 1)
+
+    return y, scores if decimals is None else scores.round(decimals)
+
+
+def crosstab_metrics(y, score):
+    fpr, tpr, thresholds = roc_curve(y, score)
+
+    threshold = thresholds[np.argmax(tpr - fpr)]
+    table     = pd.crosstab(np.where(score <= threshold, 0, 1), y)
+
+    return [
+        roc_auc_score(y, score),
+        threshold,
+        (table.iloc[0, 0] + table.iloc[1, 1]) / len(y),
+        table.iloc[1, 1] / (table.iloc[0, 1] + table.iloc[1, 1]),
+        table.iloc[0, 0] / (table.iloc[0, 0] + table.iloc[1, 0])
+    ]
+
+
+
+def test_classification_metrics_match_sklearn_auc():
+    rng    = np.random.default_rng(1337)
+    y      = (rng.random(500) < 0.6).astype(int)
+    scores = np.clip(0.5 + 0.2 * (y - 0.5) + rng.normal(0, 0.25, size = 500), 0, 1)
+
+    assert np.isclose(classification_metrics(y, scores)['AUC'], roc_auc_score(y, scores))
+    assert np.isclose(roc_auc(y, scores), roc_auc_score(y, scores))
+
+
+def test_missing_class_gives_nan_metrics():
+    y      = np.ones(10)
+    scores = np.linspace(0, 1, 10)
+
+    results = classification_metrics(y, scores)
+
+    for name in ['AUC', 'THRESHOLD', 'ACCURACY', 'SENSITIVITY', 'SPECIFICITY']:
+        assert np.isnan(results[name]), name
+
+
+def test_missing_class_in_one_replicate_only():
+    y      = np.array([0, 0, 1, 1])
+    scores = np.array([[0.1, 0.2, 0.8, 0.9], [0.1, 0.2, 0.8, 0.9]])
+
+    results = classification_metrics(np.array([y, np.ones(4)]), scores)
+
+    # the youden threshold is 0.8, and scores at or below it are negative
+    assert results['THRESHOLD'][0] == 0.8
+    assert results['ACCURACY'][0] == 0.75
+    assert np.isnan(results['ACCURACY'][1])
+    assert np.isnan(results['SENSITIVITY'][1])
+
+
+def test_replicates_match_a_crosstab_per_replicate():
+    y, scores = scored(50, 1000)
+
+    results = classification_metrics(y, scores)
+
+    expected = np.array([crosstab_metrics(y, score) for score in scores])
+    actual   = np.column_stack([results[name] for name in METRICS])
+
+    np.testing.assert_allclose(actual, expected)
+
+
+def test_single_replicate_matches_a_crosstab():
+    y, scores = scored(1, 1000, seed = 7)
+
+    results = classification_metrics(y, scores[0])
+
+    np.testing.assert_allclose([results[name] for name in METRICS], crosstab_metrics(y, scores[0]))
+
+
+@pytest.mark.parametrize('decimals', [None, 3])
+@pytest.mark.parametrize('drop_intermediate', [True, False])
+def test_roc_matches_sklearn_row_by_row(decimals, drop_intermediate):
+    y, scores = scored(20, 1220, decimals = decimals)
+
+    results = roc(y, scores, decimals = 3, drop_intermediate = drop_intermediate)
+
+    for i, score in enumerate(scores):
+        fpr, tpr, thresholds = roc_curve(y, score, drop_intermediate = drop_intermediate)
+
+        threshold = round(thresholds[np.argmax(tpr - fpr)], 3)
+        predicted = np.where(score <= threshold, 0, 1)
+
+        np.testing.assert_allclose(results['FPR'][i], fpr)
+        np.testing.assert_allclose(results['TPR'][i], tpr)
+        np.testing.assert_array_equal(results['THRESHOLDS'][i], thresholds)
+
+        assert np.isclose(results['AUC'][i], roc_auc_score(y, score))
+        assert results['THRESHOLD'][i] == threshold
+        assert np.isclose(results['ACCURACY'][i], np.mean(predicted == y))
@@ -0,0 +1,74 @@
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cowboysmall.feature import ALL_COLS, COLUMNS
+from cowboysmall.feature.graph import build_features
+from cowboysmall.feature.online import INDICATORS, Features, State
+
+
+
+INSTRUMENTS = ['NSEI', 'DJI']
+
+
+
+def market(length = 400, seed = 1337, gaps = False):
+    rng   = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size = (length, len(INSTRUMENTS))), axis = 0))
+
+    # a late listing and the odd missing bar
+    if gaps:
+        close[:rng.integers(1, 40), 1] = np.nan
+        close[rng.integers(40, length, size = 3), 0] = np.nan
+
+    bars = {
+        'OPEN':   close * (1 + rng.normal(0, 0.002, size = close.shape)),
+        'HIGH':   close * (1 + rng.uniform(0, 0.02, size = close.shape)),
+        'LOW':    close * (1 - rng.uniform(0, 0.02, size = close.shape)),
+        'CLOSE':  close,
+        'VOLUME': rng.integers(100000, 1000000, size = close.shape).astype('float64')
+    }
+
+    return pd.DataFrame({
+        f"{instrument}_{field}": values[:, i] for field, values in bars.items() for i, instrument in enumerate(INSTRUMENTS)
+    }, index = pd.bdate_range('2020-01-01', periods = length, name = 'Date'))
+
+
+def stream(data, restore_at = None):
+    features = Features(INSTRUMENTS)
+    rows     = []
+
+    for i, bar in enumerate(data.to_dict('records')):
+        # a session boundary - the state goes through json and back
+        if i == restore_at:
+            features = State.restore(json.loads(json.dumps(features.state())))
+
+        rows.append(features.update(bar))
+
+    return pd.DataFrame(rows, index = data.index)
+
+
+
+def test_online_covers_every_feature_column():
+    features = Features(INSTRUMENTS).update(market(5).iloc[0].to_dict())
+
+    assert set(ALL_COLS) - set(COLUMNS) <= set(features)
+
+
+@pytest.mark.parametrize('gaps', [False, True])
+def test_streamed_features_match_build_features(gaps):
+    data     = market(gaps = gaps)
+    expected = build_features(data, INSTRUMENTS, list(INDICATORS))
+
+    actual = stream(data, restore_at = 250)
+
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_freq = False, rtol = 1e-9, atol = 1e-9)
+
+
+def test_restored_state_continues_like_the_original():
+    data = market()
+
+    pd.testing.assert_frame_equal(stream(data, restore_at = 100), stream(data))
@@ -0,0 +1,43 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cowboysmall.feature.graph import FEATURES, compute
+from cowboysmall.feature.parallel import compute_parallel
+from cowboysmall.pool import SHARED
+
+
+
+FIELDS = ['OPEN', 'HIGH', 'LOW', 'CLOSE', 'VOLUME']
+
+
+
+def market(count, length = 300, seed = 1337):
+    rng   = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size = (length, count)), axis = 0))
+
+    blocks = {
+        'OPEN':   close * (1 + rng.normal(0, 0.002, size = close.shape)),
+        'HIGH':   close * (1 + rng.uniform(0, 0.02, size = close.shape)),
+        'LOW':    close * (1 - rng.uniform(0, 0.02, size = close.shape)),
+        'CLOSE':  close,
+        'VOLUME': rng.integers(100000, 1000000, size = close.shape).astype('float64')
+    }
+
+    instruments = [f"I{i:02d}" for i in range(count)]
+    data        = pd.DataFrame(np.hstack([blocks[field] for field in FIELDS]), columns = [f"{instrument}_{field}" for field in FIELDS for instrument in instruments])
+
+    return data, instruments
+
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_features_match_the_serial_graph(workers):
+    data, instruments = market(9)
+    columns = [f"{instrument}_{name}" for name in FEATURES for instrument in instruments]
+
+    actual = compute_parallel(data, instruments, workers = workers, shards = 4)
+
+    pd.testing.assert_frame_equal(actual[columns], compute(data, columns))
+    assert not SHARED
@@ -0,0 +1,88 @@
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cowboysmall.data.partition import list_partitions, read_partitioned, write_partitioned
+
+
+
+INDICES = ['NSEI', 'DJI', 'VIX']
+
+
+
+def master(start = '2019-06-03', end = '2021-06-30', indices = INDICES, seed = 1337):
+    rng   = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.bdate_range(start, end), name = 'Date').as_unit('ns')
+
+    return pd.DataFrame({
+        f"{name}_{field}": rng.normal(size = len(index)) for name in indices for field in ['CLOSE', 'DAILY_RETURNS']
+    }, index = index)
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / "master_data")
+
+
+
+def test_write_then_read(root):
+    data = master()
+    write_partitioned(data, root, INDICES)
+
+    actual = read_partitioned(root)
+
+    pd.testing.assert_frame_equal(actual[data.columns], data, check_freq = False)
+    assert list(actual.columns[-3:]) == ['MONTH', 'QUARTER', 'YEAR']
+
+
+def test_unchanged_partitions_are_skipped(root):
+    data = master()
+    write_partitioned(data, root, INDICES)
+
+    changed = data.copy()
+    changed.loc['2021-03-01', 'DJI_CLOSE'] = 0.0
+
+    assert write_partitioned(changed, root, INDICES) == [('DJI', 2021)]
+
+
+def test_reading_all_indices_keeps_the_written_order(root):
+    data = master()
+
+    # not alphabetical, so a glob order would move the columns around
+    write_partitioned(data, root, INDICES)
+
+    assert list(read_partitioned(root).columns[:-3]) == list(data.columns)
+    assert list(read_partitioned(root, indices = ['VIX', 'NSEI']).columns[:2]) == ['VIX_CLOSE', 'VIX_DAILY_RETURNS']
+
+
+def test_years_missing_from_the_new_frame_are_removed(root):
+    write_partitioned(master(), root, INDICES)
+
+    data = master(start = '2020-01-01')
+    write_partitioned(data, root, INDICES)
+
+    assert {year for _, year, _ in list_partitions(root)} == {2020, 2021}
+    pd.testing.assert_frame_equal(read_partitioned(root)[data.columns], data, check_freq = False)
+
+
+def test_indices_missing_from_the_new_frame_are_removed(root):
+    write_partitioned(master(), root, INDICES)
+
+    data = master(indices = ['NSEI', 'DJI'])
+    write_partitioned(data, root, INDICES)
+
+    assert {index for index, _, _ in list_partitions(root)} == {'NSEI', 'DJI'}
+    assert not os.path.exists(os.path.join(root, "index=VIX"))
+    assert list(read_partitioned(root).columns[:-3]) == list(data.columns)
+
+
+def test_date_ranges_span_partitions(root):
+    data = master()
+    write_partitioned(data, root, INDICES)
+
+    actual = read_partitioned(root, start = '2019-12-15', end = '2020-01-15')
+
+    pd.testing.assert_frame_equal(actual[data.columns], data.loc['2019-12-15':'2020-01-15'], check_freq = False)
@@ -0,0 +1,117 @@
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from statsmodels.api import Logit
+
+from cowboysmall.model.solver import downdate, fit, fit_batch
+
+
+
+FEATURES = 20
+
+
+
+def logit_data(features, rows, seed = 1337):
+    rng = np.random.default_rng(seed)
+
+    # a handful of informative columns, the rest noise
+    X = rng.normal(size = (rows, features))
+
+    linear = 0.2 + X[:, :5] @ np.linspace(0.8, 0.1, 5)
+    y      = pd.Series((rng.random(rows) < 1 / (1 + np.exp(-linear))).astype(int), name = 'y')
+
+    X = pd.DataFrame(X, columns = [f"X{i:02d}" for i in range(features)])
+    X.insert(0, 'Intercept', 1.0)
+
+    return X, y
+
+
+def subsets(count, sizes, features = FEATURES, seed = 1337):
+    rng = np.random.default_rng(seed)
+
+    return [[0, *sorted(1 + rng.choice(features, size - 1, replace = False))] for size in sizes for _ in range(count)]
+
+
+@pytest.fixture(autouse = True)
+def quiet():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+
+def test_fit_matches_statsmodels():
+    X, y  = logit_data(FEATURES, 2000)
+    model = Logit(y, X).fit(disp = 0)
+    lean  = fit(X, y)
+
+    assert lean.converged
+    assert lean.names == list(X.columns)
+
+    np.testing.assert_allclose(lean.params, model.params, atol = 1e-6)
+    np.testing.assert_allclose(lean.bse, model.bse, rtol = 1e-6)
+    np.testing.assert_allclose(lean.pvalues, model.pvalues, rtol = 1e-5, atol = 1e-12)
+
+    assert np.isclose(lean.llf, model.llf)
+    assert np.isclose(lean.aic, model.aic)
+    assert np.isclose(lean.bic, model.bic)
+
+
+def test_batches_match_single_fits_and_statsmodels(monkeypatch):
+    X, y    = logit_data(FEATURES, 2000)
+    exog    = X.to_numpy()
+    columns = subsets(8, [3, 10, 21])
+
+    # small enough that the larger subsets are split over several chunks
+    monkeypatch.setattr('cowboysmall.model.solver.BATCH_BYTES', 2000 * 8 * 40)
+
+    batched = fit_batch(exog, y, columns)
+
+    for subset, many in zip(columns, batched):
+        model = Logit(y, X.iloc[:, subset]).fit(disp = 0)
+        one   = fit(exog, y, subset)
+
+        assert many.columns == subset
+        np.testing.assert_allclose(one.params, model.params, atol = 1e-6)
+        np.testing.assert_allclose(many.params, model.params, atol = 1e-6)
+        np.testing.assert_allclose(many.bse, model.bse, rtol = 1e-6)
+        assert np.isclose(many.llf, model.llf)
+
+
+def test_warm_start_from_a_downdated_parent():
+    X, y   = logit_data(FEATURES, 2000)
+    parent = fit(X, y)
+
+    # the parent's solution and inverse information without one column
+    index = 7
+    child = [column for column in range(X.shape[1]) if column != index]
+    warm  = fit(X, y, child, np.delete(parent.params, index), downdate(parent.covariance, index))
+    cold  = fit(X, y, child)
+
+    assert warm.iterations < cold.iterations
+    np.testing.assert_allclose(warm.params, cold.params, atol = 1e-6)
+
+
+def test_downdate_matches_an_inverted_submatrix():
+    rng     = np.random.default_rng(1337)
+    matrix  = np.cov(rng.normal(size = (8, 200)))
+    inverse = np.linalg.inv(matrix)
+
+    for index in range(len(matrix)):
+        keep = np.arange(len(matrix)) != index
+
+        np.testing.assert_allclose(downdate(inverse, index), np.linalg.inv(matrix[np.ix_(keep, keep)]), rtol = 1e-9)
+
+
+def test_results_are_statsmodels_results():
+    X, y = logit_data(FEATURES, 2000)
+    lean = fit(X, y, [0, 1, 2, 3])
+
+    results = lean.results()
+
+    assert list(results.params.index) == ['Intercept', 'X00', 'X01', 'X02']
+    np.testing.assert_allclose(results.params, lean.params, atol = 1e-8)
@@ -0,0 +1,134 @@
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cowboysmall.data.store import append_frame, build_frame, is_fresh, map_frame, read_frame, read_tail, write_frame
+
+
+
+BACKENDS = ['csv', 'columnar']
+
+
+
+def frame(start = '2020-01-01', periods = 60, seed = 1337):
+    rng   = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.bdate_range(start, periods = periods), name = 'Date').as_unit('ns')
+
+    return pd.DataFrame({'A': rng.normal(size = periods), 'B': rng.integers(0, 100, size = periods)}, index = index)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "data")
+
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_write_then_read(path, backend):
+    data = write_frame(frame(), path, backend = backend)
+
+    pd.testing.assert_frame_equal(read_frame(path, backend = backend), data, check_freq = False)
+
+
+def test_backends_agree(path):
+    write_frame(frame(), path)
+
+    for selection in [{}, {'columns': ['B']}, {'start': '2020-02-01'}, {'start': '2030-01-01'}]:
+        pd.testing.assert_frame_equal(read_frame(path, backend = 'csv', **selection), read_frame(path, backend = 'columnar', **selection), check_freq = False)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('start, end', [('2020-01-15', '2020-02-10'), ('2020-01', '2020-02'), ('2020-02', None), (None, '2020-01')])
+def test_date_slices(path, backend, start, end):
+    data = write_frame(frame(), path, backend = backend)
+
+    # partial dates cover their whole period, as pandas' string slicing does
+    expected = data.loc[start:end]
+
+    pd.testing.assert_frame_equal(read_frame(path, backend = backend, start = start, end = end), expected, check_freq = False)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_append_then_tail(path, backend):
+    data = frame(periods = 80)
+    write_frame(data.iloc[:60], path, backend = backend)
+
+    assert read_tail(path, backend = backend).index[-1] == data.index[59]
+
+    append_frame(data.iloc[60:], path, backend = backend)
+
+    pd.testing.assert_frame_equal(read_tail(path, rows = 3, backend = backend), data.iloc[-3:], check_freq = False)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_append_then_range_read(path, backend):
+    data = frame(periods = 80)
+    write_frame(data.iloc[:60], path, backend = backend)
+    read_tail(path, backend = backend)
+
+    # one row at a time, each read straight after the append
+    for i in range(60, 80):
+        append_frame(data.iloc[i:i + 1], path, backend = backend)
+        pd.testing.assert_frame_equal(read_frame(path, backend = backend, start = data.index[i - 5]), data.iloc[i - 5:i + 1], check_freq = False)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_append_rejects_rows_that_are_not_newer(path, backend):
+    data = frame()
+    write_frame(data, path, backend = backend)
+
+    with pytest.raises(ValueError):
+        append_frame(data.iloc[-1:], path, backend = backend)
+
+
+def test_empty_range_keeps_dtypes(path):
+    write_frame(frame(), path)
+
+    for backend in BACKENDS:
+        empty = read_frame(path, backend = backend, start = '2030-01-01')
+
+        assert empty.empty
+        assert dict(empty.dtypes) == {'A': np.dtype('float64'), 'B': np.dtype('int64')}
+        assert empty.index.dtype == np.dtype('datetime64[ns]')
+
+
+def test_stale_copy_falls_back_to_csv(path):
+    data = write_frame(frame(), path)
+    assert is_fresh(path)
+
+    # the csv edited behind the columnar copy's back
+    schema = os.path.join(f"{path}.columnar", "schema.json")
+    data.assign(A = 0.0).to_csv(f"{path}.csv")
+    os.utime(schema, (os.path.getmtime(f"{path}.csv") - 10,) * 2)
+
+    assert not is_fresh(path)
+    assert (read_frame(path).A == 0.0).all()
+    assert (map_frame(path).A == 0.0).all()
+    assert not is_fresh(path)
+
+    assert build_frame(path)
+    assert (read_frame(path, backend = 'columnar').A == 0.0).all()
+
+
+def test_non_numeric_frames_are_kept_as_csv(path):
+    write_frame(frame(), path)
+
+    data = write_frame(frame().assign(C = 'x'), path)
+
+    assert not is_fresh(path)
+    pd.testing.assert_frame_equal(read_frame(path), data, check_freq = False)
+
+
+def test_maps_survive_a_rewrite(path):
+    write_frame(frame(), path)
+    mapped = map_frame(path)
+    before = mapped.A.to_numpy().copy()
+
+    write_frame(frame(seed = 1), path)
+    write_frame(frame(periods = 5, seed = 2), path)
+
+    np.testing.assert_array_equal(mapped.A.to_numpy(), before)
+    assert len(read_frame(path)) == 5